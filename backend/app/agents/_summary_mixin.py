@@ -11,7 +11,10 @@ License: PolyForm Noncommercial License 1.0.0
   Summary & canon mixin - Methods for chapter/volume summary generation, canon updates extraction, and focus character binding.
 """
 
+import zlib
+from collections import OrderedDict
 from datetime import datetime
+from hashlib import blake2b
 from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
@@ -29,6 +32,12 @@ from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 分卷摘要 LLM 输出缓存：相同提示词（章节摘要未变）直接复用，按 LRU 淘汰，值以 zlib 压缩存放
+# Volume summary LLM output cache: identical prompts (unchanged chapter summaries) reuse the
+# previous response. LRU-bounded; values are stored zlib-compressed.
+_VOLUME_SUMMARY_CACHE_SIZE = 64
+_volume_summary_cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+
 
 class SummaryMixin:
     """
@@ -71,8 +80,17 @@ class SummaryMixin:
         if provider == "mock" or chapter_count == 0:
             return self._fallback_volume_summary(volume_id, chapter_summaries)
 
-        yaml_content = await self._generate_volume_summary_yaml(volume_id, chapter_summaries)
-        return self._parse_volume_summary(yaml_content, volume_id, chapter_summaries)
+        yaml_content, cache_key = await self._generate_volume_summary_yaml(volume_id, chapter_summaries)
+        summary = self._load_volume_summary(yaml_content, volume_id, chapter_summaries)
+        if summary is None:
+            return self._fallback_volume_summary(volume_id, chapter_summaries)
+        # 仅缓存可成功解析的响应，格式错误的回复下次仍会重新请求
+        # Cache only responses that parse, so a malformed reply is retried on the next refresh
+        if cache_key is not None and yaml_content.strip():
+            _volume_summary_cache[cache_key] = zlib.compress(yaml_content.encode("utf-8"))
+            if len(_volume_summary_cache) > _VOLUME_SUMMARY_CACHE_SIZE:
+                _volume_summary_cache.popitem(last=False)
+        return summary
 
     async def extract_canon_updates(self, project_id: str, chapter: str, final_draft: str) -> Dict[str, Any]:
         """Extract canon updates from the final draft."""
@@ -417,8 +435,12 @@ class SummaryMixin:
         self,
         volume_id: str,
         chapter_summaries: List[ChapterSummary],
-    ) -> str:
-        """Generate VolumeSummary YAML via LLM."""
+    ) -> Tuple[str, Optional[bytes]]:
+        """
+        Generate VolumeSummary YAML via LLM.
+
+        Returns the YAML text and the cache key to store it under, or None when it was served from the cache.
+        """
         items = []
         for summary in chapter_summaries:
             items.append(
@@ -438,6 +460,22 @@ class SummaryMixin:
             context_items=None,
         )
 
+        # 键包含配置 ID 及其当前模型：用户修改该配置的模型后不会命中旧结果
+        # Key on the profile ID and its current model so editing the profile's model invalidates old entries
+        agent_name = self.get_agent_name()
+        key_hash = blake2b(digest_size=16)
+        key_hash.update(str(self.gateway.get_provider_for_agent(agent_name)).encode("utf-8"))
+        key_hash.update(b"\x00")
+        key_hash.update(str(self.gateway.get_model_for_agent(agent_name) or "").encode("utf-8"))
+        for message in messages:
+            key_hash.update(b"\x00")
+            key_hash.update(str(message.get("content") or "").encode("utf-8"))
+        cache_key = key_hash.digest()
+        cached = _volume_summary_cache.get(cache_key)
+        if cached is not None:
+            _volume_summary_cache.move_to_end(cache_key)
+            return zlib.decompress(cached).decode("utf-8"), None
+
         response = await self.call_llm(messages)
 
         if "```yaml" in response:
@@ -449,7 +487,7 @@ class SummaryMixin:
             yaml_end = response.find("```", yaml_start)
             response = response[yaml_start:yaml_end].strip()
 
-        return response
+        return response, cache_key
 
     def _parse_volume_summary(
         self,
@@ -458,6 +496,18 @@ class SummaryMixin:
         chapter_summaries: List[ChapterSummary],
     ) -> VolumeSummary:
         """Parse YAML into a VolumeSummary."""
+        summary = self._load_volume_summary(yaml_content, volume_id, chapter_summaries)
+        if summary is None:
+            return self._fallback_volume_summary(volume_id, chapter_summaries)
+        return summary
+
+    def _load_volume_summary(
+        self,
+        yaml_content: str,
+        volume_id: str,
+        chapter_summaries: List[ChapterSummary],
+    ) -> Optional[VolumeSummary]:
+        """Parse YAML into a VolumeSummary, or None if it is malformed."""
         try:
             data = yaml.safe_load(yaml_content) or {}
             data["volume_id"] = volume_id
@@ -469,7 +519,7 @@ class SummaryMixin:
             data["updated_at"] = datetime.now()
             return VolumeSummary(**data)
         except Exception:
-            return self._fallback_volume_summary(volume_id, chapter_summaries)
+            return None
 
     def _fallback_volume_summary(
         self,
@@ -190,8 +190,11 @@ class ArchivistAgent(FanfictionMixin, SummaryMixin, BaseAgent):
         ]
         scored.sort(key=lambda x: (-x["score"], -len(x["statement"]), x["statement"]))
 
-        primary = [item for item in scored if not item["simple_relation"]]
-        secondary = [item for item in scored if item["simple_relation"]]
+        # 一次遍历完成划分，保持各自的排序 / Partition in one pass, preserving sort order
+        primary: List[Dict[str, Any]] = []
+        secondary: List[Dict[str, Any]] = []
+        for item in scored:
+            (secondary if item["simple_relation"] else primary).append(item)
 
         selected: List[Dict[str, Any]] = []
         for item in primary:
@@ -384,13 +387,12 @@ class ArchivistAgent(FanfictionMixin, SummaryMixin, BaseAgent):
         }
 
     def _extract_participants(self, events: List[Any]) -> List[str]:
-        names = []
+        names: Dict[str, None] = {}
         for event in events:
-            participants = getattr(event, "participants", []) or []
-            for name in participants:
-                if name and name not in names:
-                    names.append(name)
-        return names
+            for name in getattr(event, "participants", []) or []:
+                if name:
+                    names.setdefault(name)
+        return list(names)
 
     async def _build_world_constraints(self, project_id: str, limit: int) -> List[str]:
         constraints = []
@@ -628,12 +630,15 @@ class ArchivistAgent(FanfictionMixin, SummaryMixin, BaseAgent):
 
         if len(selected) < self.MAX_FACTS:
             scored: List[Tuple[int, Dict[str, Any]]] = []
-            for fact in remaining:
+            fact_chapters = [
+                normalize_chapter_id(fact.get("introduced_in") or fact.get("source") or "")
+                for fact in remaining
+            ]
+            distances = ChapterIDValidator.calculate_distances_bulk(chapter_id, fact_chapters)
+            for fact, fact_chapter, dist in zip(remaining, fact_chapters, distances):
                 statement = str(fact.get("statement") or fact.get("content") or "")
-                fact_chapter = normalize_chapter_id(
-                    fact.get("introduced_in") or fact.get("source") or ""
-                )
-                dist = ChapterIDValidator.calculate_distance(chapter_id, fact_chapter) if fact_chapter else 999
+                if not fact_chapter:
+                    dist = 999
                 recency = max(0, 10 - min(dist, 10))
                 match = self._score_text_match(statement, keywords) * 2
                 score = recency + match
@@ -249,7 +249,8 @@ class BaseAgent(ABC):
         self,
         system_prompt: str,
         user_prompt: str,
-        context_items: Optional[List[str]] = None
+        context_items: Optional[List[str]] = None,
+        cache_context: bool = False,
     ) -> List[Dict[str, str]]:
         """
         构建发送给大模型的消息列表 - 标准格式
@@ -261,6 +262,8 @@ class BaseAgent(ABC):
             system_prompt: System message content (instructions, constraints).
             user_prompt: Main user message content (question, task).
             context_items: Optional list of context items to insert as user message.
+            cache_context: Tag the context message as a cacheable prompt prefix for
+                providers that support explicit prompt caching.
 
         Returns:
             List of message dicts with "role" and "content" keys in order:
@@ -274,10 +277,13 @@ class BaseAgent(ABC):
 
         # Add context if provided
         if context_items:
-            messages.append({
+            context_message = {
                 "role": "user",
                 "content": format_context_message(context_items, language=self.language)
-            })
+            }
+            if cache_context:
+                context_message["cache_control"] = {"type": "ephemeral"}
+            messages.append(context_message)
 
         # Add main user prompt
         messages.append({
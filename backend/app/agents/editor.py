@@ -29,6 +29,9 @@ from app.utils.version import increment_version
 
 logger = get_logger(__name__)
 
+# 角色快照中按顺序展示的字段 / Character snapshot fields rendered in order
+_SNAPSHOT_CHARACTER_FIELDS = (("identity", "身份"), ("appearance", "外貌"))
+
 class EditorAgent(BaseAgent):
     """
     编辑智能体 - 修订和完善草稿
@@ -1034,15 +1037,13 @@ class EditorAgent(BaseAgent):
                     continue
                 stars = item.get("stars")
                 star_label = f"★{stars}" if stars else ""
-                appearance = str(item.get("appearance") or "").strip()
-                identity = str(item.get("identity") or "").strip()
+                parts = [
+                    f"{label}：{value}"
+                    for key, label in _SNAPSHOT_CHARACTER_FIELDS
+                    if (value := str(item.get(key) or "").strip())
+                ]
                 aliases = item.get("aliases") or []
                 alias_text = "、".join([str(a).strip() for a in aliases if str(a).strip()][:4])
-                parts = []
-                if identity:
-                    parts.append(f"身份：{identity}")
-                if appearance:
-                    parts.append(f"外貌：{appearance}")
                 if alias_text:
                     parts.append(f"别名：{alias_text}")
                 line = f"- {name}{star_label}"
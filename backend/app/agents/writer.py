@@ -11,11 +11,15 @@ License: PolyForm Noncommercial License 1.0.0
   Writer Agent responsible for generating novel draft chapters based on scene briefs.
 """
 
-from typing import Any, Dict, List, Optional
+import asyncio
+from dataclasses import dataclass, field
+from itertools import chain, islice
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
 
 from app.config import config as app_cfg
 from app.utils.logger import get_logger
-from app.utils.llm_output import parse_json_payload
+from app.utils.llm_output import parse_json_payload_async
 
 from app.agents.base import BaseAgent
 from app.prompts import get_writer_system_prompt, writer_draft_prompt, writer_questions_prompt, writer_research_plan_prompt
@@ -27,14 +31,150 @@ logger = get_logger(__name__)
 _writer_cfg = app_cfg.get("writer", {})
 DEFAULT_TARGET_WORD_COUNT = int(_writer_cfg.get("default_target_word_count", 3000))
 
+# Scene brief section headers, joined line by line into a single block
+_BRIEF_CHARACTERS_HEADER = ("", "Characters:")
+_BRIEF_TIMELINE_HEADER = ("", "Timeline Context:")
+_BRIEF_CONSTRAINTS_HEADER = ("", "World Constraints:")
+_BRIEF_FORBIDDEN_HEADER = ("", "FORBIDDEN:")
+
+# Fields read from a scene brief, in _BriefView order
+_BRIEF_FIELDS = (
+    "chapter",
+    "title",
+    "goal",
+    "characters",
+    "timeline_context",
+    "world_constraints",
+    "style_reminder",
+    "forbidden",
+)
+_get_brief_fields = attrgetter(*_BRIEF_FIELDS)
+
+# Shared immutable default for missing sequence values in the request context
+_EMPTY: tuple = ()
+_CTX_SEQUENCE_KEYS = (
+    "character_cards",
+    "world_cards",
+    "facts",
+    "text_chunks",
+    "unresolved_gaps",
+    "timeline",
+    "character_states",
+    "user_answers",
+)
+_CTX_OPTIONAL_KEYS = ("style_card", "working_memory", "chapter_goal", "evidence_pack")
+
+# Context package sections rendered as previous-chapter summaries, with the fields shown for each
+_SUMMARY_SECTIONS = (
+    ("full_facts", ("summary", "key_events", "open_loops")),
+    ("summary_with_events", ("summary", "key_events")),
+    ("summary_only", ("summary",)),
+    ("title_only", ()),
+)
+
+
+@dataclass(slots=True)
+class _BriefView:
+    """
+    场景简要的归一化视图 - 一次性提取字段
+
+    Normalized view of a scene brief. Accepts a SceneBrief model or a plain dict
+    and extracts every field the writer needs in a single pass, so prompt
+    builders read plain attributes instead of probing the source repeatedly.
+    """
+
+    chapter: Any = ""
+    title: Any = ""
+    goal: Any = ""
+    characters: Any = field(default_factory=list)
+    timeline_context: Any = field(default_factory=dict)
+    world_constraints: Any = field(default_factory=list)
+    style_reminder: Any = ""
+    forbidden: Any = field(default_factory=list)
+
+    @classmethod
+    def from_any(cls, scene_brief: Any) -> "_BriefView":
+        """Build a view from a SceneBrief, a dict, or None (missing fields use defaults)."""
+        if isinstance(scene_brief, cls):
+            return scene_brief
+        if not isinstance(scene_brief, dict):
+            try:
+                # Fast path: SceneBrief models carry every field
+                return cls(*_get_brief_fields(scene_brief))
+            except AttributeError:
+                def get(name: str, default: Any) -> Any:
+                    return getattr(scene_brief, name, default)
+        else:
+            get = scene_brief.get
+        return cls(
+            chapter=get("chapter", ""),
+            title=get("title", ""),
+            goal=get("goal", ""),
+            characters=get("characters", []),
+            timeline_context=get("timeline_context", {}),
+            world_constraints=get("world_constraints", []),
+            style_reminder=get("style_reminder", ""),
+            forbidden=get("forbidden", []),
+        )
+
 
-def _get_field(obj, field, default=""):
-    """Safely extract field from object or dict, handling missing attributes gracefully."""
-    if hasattr(obj, field):
-        return getattr(obj, field, default)
-    if isinstance(obj, dict):
-        return obj.get(field, default)
-    return default
+def _unpack_context(context: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    提取草稿生成所需的上下文参数 / Extract draft-building kwargs from a request context.
+
+    Missing or empty sequences map to the shared ``_EMPTY`` tuple instead of a
+    fresh list per key.
+    """
+    get = context.get
+    values = {key: get(key) or _EMPTY for key in _CTX_SEQUENCE_KEYS}
+    for key in _CTX_OPTIONAL_KEYS:
+        values[key] = get(key)
+    values["user_feedback"] = get("user_feedback") or ""
+    values["target_word_count"] = get("target_word_count", DEFAULT_TARGET_WORD_COUNT)
+    return values
+
+
+def _render_item(obj: Any) -> str:
+    """渲染单个上下文对象 / Render one card/fact/state for the prompt."""
+    try:
+        return str(obj.model_dump())
+    except Exception:
+        return str(obj)
+
+
+def _render_section(tag: str, objs: Iterable[Any]) -> str:
+    """渲染带标题的上下文区块 / Render a "<tag>:" section, one item per line."""
+    return "\n".join(chain((f"{tag}:",), map(_render_item, objs)))
+
+
+def _iter_characters(characters: Iterable[Dict]) -> Iterator[str]:
+    """逐行输出角色列表 / Yield one line per scene-brief character."""
+    if not characters:
+        yield "None specified"
+        return
+    for char in characters:
+        name = char.get("name", "Unknown")
+        state = char.get("current_state", "Normal")
+        traits = char.get("relevant_traits", "")
+        yield f"- {name}: {state} ({traits})"
+
+
+def _iter_dict(data: Dict) -> Iterator[str]:
+    """逐行输出键值对 / Yield one "- key: value" line per entry."""
+    if not data:
+        yield "None"
+        return
+    for key, value in data.items():
+        yield f"- {key}: {value}"
+
+
+def _iter_list(items: Iterable) -> Iterator[str]:
+    """逐行输出列表项 / Yield one "- item" line per entry."""
+    if not items:
+        yield "None"
+        return
+    for item in items:
+        yield f"- {item}"
 
 
 class WriterAgent(BaseAgent):
@@ -62,6 +202,11 @@ class WriterAgent(BaseAgent):
         ],
     }
 
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # Strong references to fire-and-forget tasks so they are not garbage-collected mid-flight
+        self._bg_tasks: Set[asyncio.Task] = set()
+
     def get_agent_name(self) -> str:
         """获取智能体标识 - 返回 'writer'"""
         return "writer"
@@ -85,57 +230,33 @@ class WriterAgent(BaseAgent):
         Returns:
             Dict with success status, draft object, word count, pending confirmations.
         """
-        scene_brief = context.get("scene_brief")
-        if not scene_brief:
-            scene_brief = await self.draft_storage.get_scene_brief(project_id, chapter)
-
-        if not scene_brief:
-            return {"success": False, "error": "Scene brief not found"}
-
         # ============================================================================
-        # Load previous chapter context / 加载前置章节信息
+        # Load scene brief and previous chapter context / 加载场景简要与前置章节信息
         # ============================================================================
+        scene_brief = context.get("scene_brief")
         previous_summaries = context.get("previous_summaries")
         context_package = context.get("context_package")
         if previous_summaries is None and context_package:
             previous_summaries = self._build_previous_summaries_from_context(context_package)
+
+        if not scene_brief and previous_summaries is None:
+            # Both come from storage: fetch them in one concurrent round
+            scene_brief, context_package = await self.draft_storage.get_writing_bundle(project_id, chapter)
+            previous_summaries = self._build_previous_summaries_from_context(context_package)
+        elif not scene_brief:
+            scene_brief = await self.draft_storage.get_scene_brief(project_id, chapter)
+
+        if not scene_brief:
+            return {"success": False, "error": "Scene brief not found"}
+        brief = _BriefView.from_any(scene_brief)
+
         if previous_summaries is None:
             previous_summaries = await self._load_previous_summaries(project_id, chapter)
 
-        # ============================================================================
-        # Extract context from request / 提取上下文数据
-        # ============================================================================
-        style_card = context.get("style_card")
-        character_cards = context.get("character_cards") or []
-        world_cards = context.get("world_cards") or []
-        facts = context.get("facts") or []
-        text_chunks = context.get("text_chunks") or []
-        working_memory = context.get("working_memory")
-        unresolved_gaps = context.get("unresolved_gaps") or []
-        timeline = context.get("timeline") or []
-        character_states = context.get("character_states") or []
-        chapter_goal = context.get("chapter_goal")
-        user_answers = context.get("user_answers") or []
-        user_feedback = context.get("user_feedback") or ""
-        evidence_pack = context.get("evidence_pack")
-
         draft_content = await self._generate_draft(
-            scene_brief=scene_brief,
-            target_word_count=context.get("target_word_count", DEFAULT_TARGET_WORD_COUNT),
+            brief=brief,
             previous_summaries=previous_summaries,
-            style_card=style_card,
-            character_cards=character_cards,
-            world_cards=world_cards,
-            facts=facts,
-            text_chunks=text_chunks,
-            working_memory=working_memory,
-            unresolved_gaps=unresolved_gaps,
-            timeline=timeline,
-            character_states=character_states,
-            chapter_goal=chapter_goal,
-            user_answers=user_answers,
-            user_feedback=user_feedback,
-            evidence_pack=evidence_pack,
+            **_unpack_context(context),
         )
 
         pending_confirmations = []
@@ -150,12 +271,8 @@ class WriterAgent(BaseAgent):
             pending_confirmations=pending_confirmations,
         )
 
-        # Build chapter bindings to enable context linking
-        try:
-            from app.services.chapter_binding_service import chapter_binding_service
-            await chapter_binding_service.build_bindings(project_id, chapter, force=True)
-        except Exception as exc:
-            logger.warning("Failed to build chapter bindings for %s:%s: %s", project_id, chapter, exc)
+        # Build chapter bindings in the background; the draft result does not depend on them
+        self._schedule_bindings(project_id, chapter)
 
         return {
             "success": True,
@@ -184,24 +301,22 @@ class WriterAgent(BaseAgent):
         Returns:
             List of 3 question dicts with "type" and "text" keys.
         """
-        brief_chapter = _get_field(scene_brief, "chapter", "")
-        brief_title = _get_field(scene_brief, "title", "")
-        brief_goal = _get_field(scene_brief, "goal", "")
-        brief_characters = _get_field(scene_brief, "characters", [])
+        brief = _BriefView.from_any(scene_brief)
 
         characters_text = []
-        for char in brief_characters or []:
+        for char in brief.characters or []:
             if isinstance(char, dict):
                 characters_text.append(char.get("name", str(char)))
-            elif hasattr(char, "name"):
+                continue
+            try:
                 characters_text.append(char.name)
-            else:
+            except AttributeError:
                 characters_text.append(str(char))
 
         context_items = [
-            f"Chapter: {brief_chapter}",
-            f"Title: {brief_title}",
-            f"Goal: {brief_goal or chapter_goal}",
+            f"Chapter: {brief.chapter}",
+            f"Title: {brief.title}",
+            f"Goal: {brief.goal or chapter_goal}",
             f"Characters: {', '.join(characters_text) if characters_text else 'None'}",
         ]
 
@@ -209,7 +324,7 @@ class WriterAgent(BaseAgent):
             context_items.append("事实摘要（节选，供反问参考）：")
             for key in ["summary_with_events", "summary_only", "full_facts"]:
                 items = context_package.get(key, []) or []
-                for item in items[:2]:
+                for item in islice(items, 2):
                     summary = str(item.get("summary") or "").strip()
                     events = item.get("key_events") or []
                     chapter_id = item.get("chapter") or ""
@@ -219,7 +334,7 @@ class WriterAgent(BaseAgent):
                         if summary:
                             block.append(f"摘要：{summary}")
                         if events:
-                            block.append("事件：" + "；".join([str(e) for e in events[:4]]))
+                            block.append("事件：" + "；".join(map(str, islice(events, 4))))
                         context_items.append("\n".join(block))
         prompt = writer_questions_prompt(context_items, language=self.language)
 
@@ -230,7 +345,7 @@ class WriterAgent(BaseAgent):
         )
 
         raw = await self.call_llm(messages)
-        data, err = parse_json_payload(raw, expected_type=list)
+        data, err = await parse_json_payload_async(raw, expected_type=list)
         if err:
             logger.warning("Writer questions parse failed: %s", err)
             logger.debug("Writer questions raw preview: %s", str(raw or "")[:200])
@@ -292,7 +407,7 @@ class WriterAgent(BaseAgent):
         )
 
         raw = await self.call_llm(messages)
-        data, err = parse_json_payload(raw, expected_type=dict)
+        data, err = await parse_json_payload_async(raw, expected_type=dict)
         if err:
             logger.warning("Writer plan parse failed: %s", err)
             logger.debug("Writer plan raw preview: %s", str(raw or "")[:200])
@@ -328,28 +443,35 @@ class WriterAgent(BaseAgent):
             return
 
         messages = self._build_draft_messages(
-            scene_brief=scene_brief,
-            target_word_count=context.get("target_word_count", DEFAULT_TARGET_WORD_COUNT),
+            brief=_BriefView.from_any(scene_brief),
             previous_summaries=context.get("previous_summaries"),
-            style_card=context.get("style_card"),
-            character_cards=context.get("character_cards") or [],
-            world_cards=context.get("world_cards") or [],
-            facts=context.get("facts") or [],
-            text_chunks=context.get("text_chunks") or [],
-            working_memory=context.get("working_memory"),
-            unresolved_gaps=context.get("unresolved_gaps") or [],
-            timeline=context.get("timeline") or [],
-            character_states=context.get("character_states") or [],
-            chapter_goal=context.get("chapter_goal"),
-            user_answers=context.get("user_answers") or [],
-            user_feedback=context.get("user_feedback") or "",
-            evidence_pack=context.get("evidence_pack"),
             include_plan=False,
+            **_unpack_context(context),
         )
 
         async for chunk in self.call_llm_stream(messages):
             yield chunk
 
+    def _schedule_bindings(self, project_id: str, chapter: str) -> None:
+        """后台构建章节绑定 - 不阻塞草稿返回"""
+        try:
+            from app.services.chapter_binding_service import chapter_binding_service
+            task = asyncio.create_task(chapter_binding_service.build_bindings(project_id, chapter, force=True))
+        except Exception as exc:
+            logger.warning("Failed to build chapter bindings for %s:%s: %s", project_id, chapter, exc)
+            return
+
+        def _on_done(done: asyncio.Task) -> None:
+            self._bg_tasks.discard(done)
+            if done.cancelled():
+                return
+            exc = done.exception()
+            if exc is not None:
+                logger.warning("Failed to build chapter bindings for %s:%s: %s", project_id, chapter, exc)
+
+        self._bg_tasks.add(task)
+        task.add_done_callback(_on_done)
+
     async def _load_previous_summaries(self, project_id: str, current_chapter: str) -> List[str]:
         """加载前置章节摘要 - 从存储或构建"""
         context_package = await self.draft_storage.get_context_for_writing(project_id, current_chapter)
@@ -357,26 +479,25 @@ class WriterAgent(BaseAgent):
 
     def _build_previous_summaries_from_context(self, context_package: Dict[str, Any]) -> List[str]:
         """从结构化上下文包构建摘要块 - 支持多种摘要格式"""
-        blocks: List[str] = []
+        if not context_package:
+            return []
 
-        def add_block(items: List[Dict[str, Any]], fields: List[str]) -> None:
-            """Helper: Add formatted summary block for each item"""
+        blocks: List[str] = []
+        for key, fields in _SUMMARY_SECTIONS:
+            items = context_package.get(key)
+            if not items:
+                continue
             for item in items:
                 parts = [f"{item.get('chapter')}: {item.get('title')}"]
-                for field in fields:
-                    value = item.get(field)
+                for field_name in fields:
+                    value = item.get(field_name)
                     if isinstance(value, list):
                         value = "\n".join([f"- {val}" for val in value]) or "-"
                     if value:
-                        parts.append(f"{field}:\n{value}")
+                        parts.append(f"{field_name}:\n{value}")
                 blocks.append("\n".join(parts))
 
-        add_block(context_package.get("full_facts", []), ["summary", "key_events", "open_loops"])
-        add_block(context_package.get("summary_with_events", []), ["summary", "key_events"])
-        add_block(context_package.get("summary_only", []), ["summary"])
-        add_block(context_package.get("title_only", []), [])
-
-        for volume in context_package.get("volume_summaries", []):
+        for volume in context_package.get("volume_summaries") or _EMPTY:
             parts = [f"{volume.get('volume_id')}: {volume.get('brief_summary')}"]
             key_themes = volume.get("key_themes") or []
             major_events = volume.get("major_events") or []
@@ -390,7 +511,7 @@ class WriterAgent(BaseAgent):
 
     async def _generate_draft(
         self,
-        scene_brief: Optional[SceneBrief],
+        brief: _BriefView,
         target_word_count: int,
         previous_summaries: List[str],
         style_card: Optional[StyleCard] = None,
@@ -414,7 +535,7 @@ class WriterAgent(BaseAgent):
         Extracts draft content from <draft> tags if present.
 
         Args:
-            scene_brief: Scene brief for this chapter.
+            brief: Normalized scene brief for this chapter.
             target_word_count: Target word count for the draft.
             previous_summaries: List of previous chapter summaries for context.
             style_card: Optional style card for consistent writing style.
@@ -435,7 +556,7 @@ class WriterAgent(BaseAgent):
             Generated draft text (extracted from tags if present).
         """
         messages = self._build_draft_messages(
-            scene_brief=scene_brief,
+            brief=brief,
             target_word_count=target_word_count,
             previous_summaries=previous_summaries,
             style_card=style_card,
@@ -468,7 +589,7 @@ class WriterAgent(BaseAgent):
 
     def _build_draft_messages(
         self,
-        scene_brief: Optional[SceneBrief],
+        brief: _BriefView,
         target_word_count: int,
         previous_summaries: List[str],
         style_card: Optional[StyleCard] = None,
@@ -495,34 +616,26 @@ class WriterAgent(BaseAgent):
                 "Only write content that serves the goal."
             )
 
-        brief_chapter = _get_field(scene_brief, "chapter", "")
-        brief_title = _get_field(scene_brief, "title", "")
-        brief_goal = _get_field(scene_brief, "goal", "")
-        brief_characters = _get_field(scene_brief, "characters", [])
-        brief_timeline = _get_field(scene_brief, "timeline_context", {})
-        brief_constraints = _get_field(scene_brief, "world_constraints", [])
-        brief_style = _get_field(scene_brief, "style_reminder", "")
-        brief_forbidden = _get_field(scene_brief, "forbidden", [])
-
-        brief_text = f"""Scene Brief:
-Chapter: {brief_chapter}
-Title: {brief_title}
-Goal: {brief_goal}
-
-Characters:
-{self._format_characters(brief_characters)}
-
-Timeline Context:
-{self._format_dict(brief_timeline)}
-
-World Constraints:
-{self._format_list(brief_constraints)}
-
-Style Reminder: {brief_style}
-
-FORBIDDEN:
-{self._format_list(brief_forbidden)}
-"""
+        brief_text = "\n".join(
+            chain(
+                (
+                    "Scene Brief:",
+                    f"Chapter: {brief.chapter}",
+                    f"Title: {brief.title}",
+                    f"Goal: {brief.goal}",
+                ),
+                _BRIEF_CHARACTERS_HEADER,
+                _iter_characters(brief.characters),
+                _BRIEF_TIMELINE_HEADER,
+                _iter_dict(brief.timeline_context),
+                _BRIEF_CONSTRAINTS_HEADER,
+                _iter_list(brief.world_constraints),
+                ("", f"Style Reminder: {brief.style_reminder}"),
+                _BRIEF_FORBIDDEN_HEADER,
+                _iter_list(brief.forbidden),
+                ("",),
+            )
+        )
         context_items.append(brief_text)
 
         if working_memory:
@@ -530,7 +643,7 @@ FORBIDDEN:
 
         if unresolved_gaps:
             lines = ["未解决缺口（不得编造，必须留白或用[TO_CONFIRM:…]标记）:"]
-            for gap in unresolved_gaps[:6]:
+            for gap in islice(unresolved_gaps, 6):
                 if not isinstance(gap, dict):
                     continue
                 text = str(gap.get("text") or "").strip()
@@ -547,7 +660,7 @@ FORBIDDEN:
 
         if text_chunks:
             lines = ["Text Chunks:"]
-            for chunk in text_chunks[:6]:
+            for chunk in islice(text_chunks, 6):
                 if isinstance(chunk, dict):
                     chapter = chunk.get("chapter") or ""
                     text = chunk.get("text") or ""
@@ -561,7 +674,7 @@ FORBIDDEN:
             items = evidence_pack.get("items") or []
             if items:
                 lines = ["Evidence Pack:"]
-                for item in items[:12]:
+                for item in islice(items, 12):
                     if not isinstance(item, dict):
                         continue
                     item_type = str(item.get("type") or "").strip()
@@ -579,40 +692,16 @@ FORBIDDEN:
 
         if not use_compact_context:
             if character_cards:
-                lines = ["Character Cards:"]
-                for card in character_cards[:10]:
-                    try:
-                        lines.append(str(card.model_dump()))
-                    except Exception:
-                        lines.append(str(card))
-                context_items.append("\n".join(lines))
+                context_items.append(_render_section("Character Cards", islice(character_cards, 10)))
 
             if world_cards:
-                lines = ["World Cards:"]
-                for card in world_cards[:10]:
-                    try:
-                        lines.append(str(card.model_dump()))
-                    except Exception:
-                        lines.append(str(card))
-                context_items.append("\n".join(lines))
+                context_items.append(_render_section("World Cards", islice(world_cards, 10)))
 
             if facts and not (evidence_pack and evidence_pack.get("items")):
-                lines = ["Canon Facts:"]
-                for fact in facts[:20]:
-                    try:
-                        lines.append(str(fact.model_dump()))
-                    except Exception:
-                        lines.append(str(fact))
-                context_items.append("\n".join(lines))
+                context_items.append(_render_section("Canon Facts", islice(facts, 20)))
 
             if character_states:
-                lines = ["Character States:"]
-                for state in character_states[:20]:
-                    try:
-                        lines.append(str(state.model_dump()))
-                    except Exception:
-                        lines.append(str(state))
-                context_items.append("\n".join(lines))
+                context_items.append(_render_section("Character States", islice(character_states, 20)))
 
         if user_answers:
             lines = ["User Answers:"]
@@ -634,7 +723,7 @@ FORBIDDEN:
         prompt = writer_draft_prompt(
             include_plan=include_plan,
             chapter_goal=chapter_goal or "",
-            brief_goal=brief_goal or "",
+            brief_goal=brief.goal or "",
             target_word_count=target_word_count,
             language=self.language,
         )
@@ -643,26 +732,5 @@ FORBIDDEN:
             system_prompt=prompt.system,
             user_prompt=prompt.user,
             context_items=context_items,
+            cache_context=True,
         )
-
-    def _format_characters(self, characters: List[Dict]) -> str:
-        if not characters:
-            return "None specified"
-        lines = []
-        for char in characters:
-            name = char.get("name", "Unknown")
-            state = char.get("current_state", "Normal")
-            traits = char.get("relevant_traits", "")
-            lines.append(f"- {name}: {state} ({traits})")
-        return "\n".join(lines)
-
-    def _format_dict(self, data: Dict) -> str:
-        if not data:
-            return "None"
-        return "\n".join([f"- {key}: {value}" for key, value in data.items()])
-
-    def _format_list(self, items: List) -> str:
-        if not items:
-            return "None"
-        return "\n".join([f"- {item}" for item in items])
-
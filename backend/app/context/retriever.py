@@ -2,11 +2,27 @@
 Dynamic context retriever.
 """
 
-from typing import Any, Dict, List, Tuple
+import asyncio
+from bisect import bisect_left
+from collections import defaultdict
+from heapq import heappop, heappush
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.utils.chapter_id import ChapterIDValidator
 from app.utils.dynamic_ranges import calculate_dynamic_ranges
 
+# 空上下文骨架（空集合用元组共享），返回前按需浅拷贝
+_EMPTY_CONTEXT: Dict[str, Any] = {
+    "full_facts": (),
+    "summary_with_events": (),
+    "summary_only": (),
+    "title_only": (),
+    "volume_summaries": (),
+    "previous_tail_chunks": (),
+    "total_tokens": 0,
+    "chapters_retrieved": 0,
+}
+
 
 class DynamicContextRetriever:
     """Retrieve context by distance and budget, with cross-volume summaries."""
@@ -23,33 +39,53 @@ class DynamicContextRetriever:
     LEVEL_SUMMARY_ONLY = "summary_only"
     LEVEL_TITLE_ONLY = "title_only"
 
+    # 升级阶梯与各级效用（凹：单位 token 的边际收益逐级递减）
+    # Upgrade ladder and per-level utility (concave: marginal gain per token shrinks per step)
+    _LEVEL_LADDER = (LEVEL_TITLE_ONLY, LEVEL_SUMMARY_ONLY, LEVEL_SUMMARY_WITH_EVENTS, LEVEL_FULL_FACTS)
+    _LEVEL_UTILITY = (1.0, 3.0, 4.0, 6.0)
+
+    _LEVEL_TOKENS = {
+        LEVEL_FULL_FACTS: TOKENS_PER_FACT_LIST + TOKENS_PER_CHAPTER_SUMMARY,
+        LEVEL_SUMMARY_WITH_EVENTS: TOKENS_PER_CHAPTER_SUMMARY,
+        LEVEL_SUMMARY_ONLY: TOKENS_PER_CHAPTER_SUMMARY,
+        LEVEL_TITLE_ONLY: TOKENS_PER_TITLE,
+    }
+    _LEVEL_KEYS = {
+        LEVEL_FULL_FACTS: "full_facts",
+        LEVEL_SUMMARY_WITH_EVENTS: "summary_with_events",
+        LEVEL_SUMMARY_ONLY: "summary_only",
+        LEVEL_TITLE_ONLY: "title_only",
+    }
+
     def __init__(self, storage):
         self.storage = storage
+        # 可选存储能力在构造时绑定一次，避免每次检索都 hasattr 探测
+        self._list_volume_summaries = getattr(storage, "list_volume_summaries", None)
+        self._get_chapter_tail_chunks = getattr(storage, "get_chapter_tail_chunks", None)
+        self._get_chapter_summaries_bulk = getattr(storage, "get_chapter_summaries_bulk", None)
+        self._list_volume_summary_ids = getattr(storage, "list_volume_summary_ids", None)
+        self._get_volume_summaries_bulk = getattr(storage, "get_volume_summaries_bulk", None)
 
     async def retrieve_context(self, project_id: str, current_chapter: str) -> Dict[str, Any]:
         all_chapters = await self._get_all_previous_chapters(project_id, current_chapter)
         total_chapters = len(all_chapters)
 
         if total_chapters == 0:
-            return {
-                "full_facts": [],
-                "summary_with_events": [],
-                "summary_only": [],
-                "title_only": [],
-                "volume_summaries": [],
-                "previous_tail_chunks": [],
-                "total_tokens": 0,
-                "chapters_retrieved": 0,
-            }
+            return dict(_EMPTY_CONTEXT)
 
         ranges = calculate_dynamic_ranges(total_chapters)
         chapter_levels = self._assign_retrieval_levels(all_chapters, current_chapter, ranges)
-        context = await self._retrieve_within_budget(project_id, chapter_levels, self.MAX_CONTEXT_TOKENS)
+        # 预算规划不涉及 I/O，先行完成；卷摘要据此只取放得下的部分（惰性加载正文）。
+        # 章节摘要、卷摘要与上一章尾部片段互不依赖，随后并发获取。
+        plan, used_tokens = self._plan_levels(chapter_levels, self.MAX_CONTEXT_TOKENS)
+        context, volume_summaries, (tail_chunks, tail_tokens) = await asyncio.gather(
+            self._fetch_planned_chapters(project_id, plan, used_tokens),
+            self._retrieve_volume_summaries(project_id, current_chapter, used_tokens),
+            self._retrieve_previous_tail_chunks(project_id, all_chapters[-1]),
+        )
 
-        volume_summaries = await self._retrieve_volume_summaries(project_id, current_chapter, context["total_tokens"])
         context["volume_summaries"] = volume_summaries["items"]
         context["total_tokens"] += volume_summaries["tokens"]
-        tail_chunks, tail_tokens = await self._retrieve_previous_tail_chunks(project_id, current_chapter)
         context["previous_tail_chunks"] = tail_chunks
         context["total_tokens"] += tail_tokens
         return context
@@ -60,145 +96,162 @@ class DynamicContextRetriever:
         current_chapter: str,
         ranges: Dict[str, int],
     ) -> List[Tuple[str, str, int]]:
-        result = []
-        total = len(all_chapters)
-        for idx, chapter in enumerate(all_chapters):
-            # 距离按“顺序列表中的相对位置”计算，确保与用户自定义章节顺序一致。
-            # all_chapters 为“当前章节之前的章节列表（旧 -> 新）”，因此越靠后越近。
-            distance = max(1, total - idx)
-            if distance <= ranges["full_facts"]:
-                level = self.LEVEL_FULL_FACTS
-            elif distance <= ranges["summary_events"]:
-                level = self.LEVEL_SUMMARY_WITH_EVENTS
-            elif distance <= ranges["summary_only"]:
-                level = self.LEVEL_SUMMARY_ONLY
-            else:
-                level = self.LEVEL_TITLE_ONLY
-            result.append((chapter, level, distance))
-        result.sort(key=lambda item: item[2])
-        return result
+        # 阈值表 + bisect 取代逐章 if/elif：distance <= bounds[i] 即落入 levels[i]。
+        bounds = (ranges["full_facts"], ranges["summary_events"], ranges["summary_only"])
+        levels = (self.LEVEL_FULL_FACTS, self.LEVEL_SUMMARY_WITH_EVENTS, self.LEVEL_SUMMARY_ONLY, self.LEVEL_TITLE_ONLY)
+        # 距离按“顺序列表中的相对位置”计算，确保与用户自定义章节顺序一致。
+        # all_chapters 为“当前章节之前的章节列表（旧 -> 新）”，因此越靠后越近；
+        # 逆序遍历即得到按距离升序的结果，无需再排序。
+        return [
+            (chapter, levels[bisect_left(bounds, distance)], distance)
+            for distance, chapter in enumerate(reversed(all_chapters), start=1)
+        ]
 
-    async def _retrieve_within_budget(
+    async def _fetch_planned_chapters(
         self,
         project_id: str,
-        chapter_levels: List[Tuple[str, str, int]],
-        max_tokens: int,
+        plan: List[Tuple[str, str]],
+        used_tokens: int,
     ) -> Dict[str, Any]:
-        used_tokens = 0
-        result = {
-            "full_facts": [],
-            "summary_with_events": [],
-            "summary_only": [],
-            "title_only": [],
-            "volume_summaries": [],
-            "total_tokens": 0,
-            "chapters_retrieved": 0,
-        }
-
-        for chapter_id, level, _distance in chapter_levels:
-            tokens_needed = self._estimate_tokens(level)
-            if used_tokens + tokens_needed <= max_tokens:
-                content = await self._retrieve_chapter_content(project_id, chapter_id, level)
-                result[self._level_to_key(level)].append(content)
-                used_tokens += tokens_needed
-            else:
-                downgraded = self._downgrade_level(level)
-                tokens_needed = self._estimate_tokens(downgraded)
-                if used_tokens + tokens_needed <= max_tokens:
-                    content = await self._retrieve_chapter_content(project_id, chapter_id, downgraded)
-                    result[self._level_to_key(downgraded)].append(content)
-                    used_tokens += tokens_needed
-                else:
-                    content = await self._retrieve_chapter_content(project_id, chapter_id, self.LEVEL_TITLE_ONLY)
-                    result["title_only"].append(content)
-                    used_tokens += self.TOKENS_PER_TITLE
-            result["chapters_retrieved"] += 1
+        # Fetch pass: load every planned chapter summary in one bulk request
+        summaries = await self._get_chapter_summaries(project_id, [chapter_id for chapter_id, _level in plan])
+        buckets: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        level_key = self._LEVEL_KEYS.get
+        build_content = self._build_chapter_content
+        for chapter_id, level in plan:
+            buckets[level_key(level, "title_only")].append(build_content(chapter_id, summaries.get(chapter_id), level))
 
+        result = dict(_EMPTY_CONTEXT)
+        result.update(buckets)
         result["total_tokens"] = used_tokens
+        result["chapters_retrieved"] = len(plan)
         return result
 
+    def _plan_levels(
+        self,
+        chapter_levels: List[Tuple[str, str, int]],
+        max_tokens: int,
+    ) -> Tuple[List[Tuple[str, str]], int]:
+        """
+        注水式分配：所有章节先取标题，再反复执行“单位 token 效用增益”最高的一次升级，
+        直到预算耗尽；各章节按距离分配的层级是其升级上限。
+
+        Water-filling allocation: every chapter starts at title_only, then the upgrade
+        with the highest utility gain per token (utility weighted by 1/distance) is
+        applied until the budget runs out. The distance-assigned level caps each chapter.
+        """
+        ladder = self._LEVEL_LADDER
+        utility = self._LEVEL_UTILITY
+        costs = [self._estimate_tokens(level) for level in ladder]
+
+        # 截断与同比率时的就近优先都依赖 chapter_levels 按距离升序（由 _assign_retrieval_levels 构造保证）
+
+        # 连标题都放不下时只保留最近的章节，远端章节不再取数
+        title_capacity = max_tokens // costs[0] if costs[0] > 0 else len(chapter_levels)
+        if len(chapter_levels) > title_capacity:
+            chapter_levels = chapter_levels[:title_capacity]
+
+        rank = {level: step for step, level in enumerate(ladder)}
+        ceilings = [rank.get(level, 0) for _chapter_id, level, _distance in chapter_levels]
+        steps = [0] * len(chapter_levels)
+        used_tokens = costs[0] * len(chapter_levels)
+        heap: List[Tuple[float, int]] = []
+
+        def push_next_upgrade(index: int) -> None:
+            step = steps[index]
+            if step >= ceilings[index]:
+                return
+            delta_tokens = costs[step + 1] - costs[step]
+            gain = (utility[step + 1] - utility[step]) / chapter_levels[index][2]
+            ratio = gain / delta_tokens if delta_tokens > 0 else float("inf")
+            # 同比率时索引小者（距离更近）优先
+            heappush(heap, (-ratio, index))
+
+        # 预算仅够标题时跳过整个升级阶段
+        budget_tight = used_tokens + min(costs[1:]) - costs[0] > max_tokens
+        if not budget_tight:
+            for index in range(len(chapter_levels)):
+                push_next_upgrade(index)
+
+        while heap:
+            _ratio, index = heappop(heap)
+            step = steps[index]
+            delta_tokens = costs[step + 1] - costs[step]
+            if used_tokens + delta_tokens > max_tokens:
+                continue
+            used_tokens += delta_tokens
+            steps[index] = step + 1
+            push_next_upgrade(index)
+
+        plan = [(chapter_id, ladder[step]) for (chapter_id, _level, _distance), step in zip(chapter_levels, steps)]
+        return plan, used_tokens
+
     async def _retrieve_volume_summaries(
         self,
         project_id: str,
         current_chapter: str,
         used_tokens: int,
     ) -> Dict[str, Any]:
-        if not hasattr(self.storage, "list_volume_summaries"):
-            return {"items": [], "tokens": 0}
-
         current_volume = ChapterIDValidator.extract_volume_id(current_chapter) or "V1"
-        summaries = await self.storage.list_volume_summaries(project_id)
-        items = []
-        tokens = 0
+        room = max(0, self.MAX_CONTEXT_TOKENS - used_tokens) // self.TOKENS_PER_VOLUME_SUMMARY
 
-        for summary in summaries:
-            if summary.volume_id == current_volume:
-                continue
-            if used_tokens + tokens + self.TOKENS_PER_VOLUME_SUMMARY > self.MAX_CONTEXT_TOKENS:
-                break
-            items.append(
-                {
-                    "volume_id": summary.volume_id,
-                    "brief_summary": summary.brief_summary,
-                    "key_themes": summary.key_themes,
-                    "major_events": summary.major_events,
-                }
-            )
-            tokens += self.TOKENS_PER_VOLUME_SUMMARY
-
-        return {"items": items, "tokens": tokens}
+        if self._list_volume_summary_ids is not None and self._get_volume_summaries_bulk is not None:
+            # 先列出有摘要的卷 ID，按预算选定后只读取入选卷的正文
+            volume_ids = [
+                volume_id
+                for volume_id in await self._list_volume_summary_ids(project_id)
+                if volume_id != current_volume
+            ]
+            chosen = volume_ids[:room]
+            summaries = await self._get_volume_summaries_bulk(project_id, chosen) if chosen else []
+        elif self._list_volume_summaries is not None:
+            summaries = [
+                summary
+                for summary in await self._list_volume_summaries(project_id)
+                if summary.volume_id != current_volume
+            ][:room]
+        else:
+            return {"items": [], "tokens": 0}
+
+        items = [
+            {
+                "volume_id": summary.volume_id,
+                "brief_summary": summary.brief_summary,
+                "key_themes": summary.key_themes,
+                "major_events": summary.major_events,
+            }
+            for summary in summaries
+        ]
+        return {"items": items, "tokens": len(items) * self.TOKENS_PER_VOLUME_SUMMARY}
 
     async def _retrieve_previous_tail_chunks(
         self,
         project_id: str,
-        current_chapter: str,
+        previous_chapter: str,
     ) -> Tuple[List[Dict[str, Any]], int]:
-        if not hasattr(self.storage, "get_chapter_tail_chunks"):
-            return [], 0
-        chapters = await self._get_all_previous_chapters(project_id, current_chapter)
-        if not chapters:
+        if self._get_chapter_tail_chunks is None:
             return [], 0
-        previous = chapters[-1]
-        chunks = await self.storage.get_chapter_tail_chunks(project_id, previous, limit=2)
+        chunks = await self._get_chapter_tail_chunks(project_id, previous_chapter, limit=2)
         token_estimate = 0
         for chunk in chunks:
             token_estimate += max(len(str(chunk.get("text") or "")) // 2, self.TOKENS_PER_TAIL_CHUNK)
         return chunks, token_estimate
 
-    def _downgrade_level(self, level: str) -> str:
-        downgrade_map = {
-            self.LEVEL_FULL_FACTS: self.LEVEL_SUMMARY_WITH_EVENTS,
-            self.LEVEL_SUMMARY_WITH_EVENTS: self.LEVEL_SUMMARY_ONLY,
-            self.LEVEL_SUMMARY_ONLY: self.LEVEL_TITLE_ONLY,
-            self.LEVEL_TITLE_ONLY: self.LEVEL_TITLE_ONLY,
-        }
-        return downgrade_map.get(level, self.LEVEL_TITLE_ONLY)
-
     def _estimate_tokens(self, level: str) -> int:
-        token_map = {
-            self.LEVEL_FULL_FACTS: self.TOKENS_PER_FACT_LIST + self.TOKENS_PER_CHAPTER_SUMMARY,
-            self.LEVEL_SUMMARY_WITH_EVENTS: self.TOKENS_PER_CHAPTER_SUMMARY,
-            self.LEVEL_SUMMARY_ONLY: self.TOKENS_PER_CHAPTER_SUMMARY,
-            self.LEVEL_TITLE_ONLY: self.TOKENS_PER_TITLE,
-        }
-        return token_map.get(level, self.TOKENS_PER_TITLE)
+        return self._LEVEL_TOKENS.get(level, self.TOKENS_PER_TITLE)
 
     def _level_to_key(self, level: str) -> str:
-        key_map = {
-            self.LEVEL_FULL_FACTS: "full_facts",
-            self.LEVEL_SUMMARY_WITH_EVENTS: "summary_with_events",
-            self.LEVEL_SUMMARY_ONLY: "summary_only",
-            self.LEVEL_TITLE_ONLY: "title_only",
-        }
-        return key_map.get(level, "title_only")
+        return self._LEVEL_KEYS.get(level, "title_only")
 
-    async def _retrieve_chapter_content(
-        self,
-        project_id: str,
-        chapter_id: str,
-        level: str,
-    ) -> Dict[str, Any]:
-        summary = await self.storage.get_chapter_summary(project_id, chapter_id)
+    async def _get_chapter_summaries(self, project_id: str, chapter_ids: List[str]) -> Dict[str, Any]:
+        if self._get_chapter_summaries_bulk is not None:
+            return await self._get_chapter_summaries_bulk(project_id, chapter_ids)
+        summaries = await asyncio.gather(
+            *(self.storage.get_chapter_summary(project_id, chapter_id) for chapter_id in chapter_ids)
+        )
+        return dict(zip(chapter_ids, summaries))
+
+    def _build_chapter_content(self, chapter_id: str, summary: Optional[Any], level: str) -> Dict[str, Any]:
         if not summary:
             return {"chapter": chapter_id, "title": chapter_id, "content": "", "level": level}
 
@@ -235,11 +288,5 @@ class DynamicContextRetriever:
             return chapters
         if current_weight <= 0:
             return chapters
-        previous = []
-        for chapter_id in chapters:
-            try:
-                if ChapterIDValidator.calculate_weight(chapter_id) < current_weight:
-                    previous.append(chapter_id)
-            except Exception:
-                continue
-        return previous
+        weights = ChapterIDValidator.calculate_weights_bulk(chapters)
+        return [chapter_id for chapter_id, weight in zip(chapters, weights) if weight < current_weight]
@@ -12,8 +12,9 @@ License: PolyForm Noncommercial License 1.0.0
   Manages token allocation across different content categories (cards, canon, summaries, output).
 """
 
-from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 from app.config import config
 from app.context_engine.token_counter import count_tokens, get_model_context_window
 from app.utils.logger import get_logger
@@ -21,7 +22,7 @@ from app.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class BudgetAllocation:
     """
     预算分配结果 / Budget allocation result
@@ -62,7 +63,7 @@ class BudgetAllocation:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class BudgetUsage:
     """
     预算使用情况 / Budget usage tracking
@@ -93,6 +94,29 @@ class BudgetUsage:
         return self.used / self.allocated
 
 
+# Agent 特定调整系数 / Per-agent budget multipliers
+_AGENT_BUDGET_ADJUSTMENTS: Dict[str, Dict[str, float]] = {
+    "archivist": {
+        "cards": 1.2,
+        "canon": 1.3,
+        "summaries": 0.8,
+        "current_draft": 0.7,
+    },
+    "writer": {
+        "cards": 1.0,
+        "canon": 1.0,
+        "summaries": 1.2,
+        "current_draft": 1.1,
+    },
+    "editor": {
+        "cards": 0.8,
+        "canon": 0.8,
+        "summaries": 0.9,
+        "current_draft": 1.3,
+    },
+}
+
+
 class ContextBudgetManager:
     """
     上下文预算管理器 / Context Budget Manager
@@ -134,10 +158,19 @@ class ContextBudgetManager:
         # Calculate total available budget
         self._context_window = get_model_context_window(model_name) if model_name else 128000
         self._total_budget = self._calculate_total_budget()
+        self._allocation = self._compute_allocation()
+        # 按类别预算的查找表 / Per-category allocated tokens for hot-path lookups
+        self._allocated: Dict[str, int] = self._allocation.to_dict()
+
+        # 各 Agent 的分配只取决于固定的基础分配，按 Agent 缓存
+        # Per-agent allocations depend only on the fixed base allocation; cache per agent
+        self._agent_allocations: Dict[str, Dict[str, int]] = {}
 
         # 使用追踪
         # Track usage by category
         self._usage: Dict[str, BudgetUsage] = {}
+        # 已用总量随 track_usage 增量维护 / Running total maintained by track_usage
+        self._total_used = 0
 
     def _calculate_total_budget(self) -> int:
         """计算总可用预算（扣除输出预留） / Calculate total available budget (minus output reserve)."""
@@ -146,8 +179,8 @@ class ContextBudgetManager:
         output_reserve = max(output_reserve, self.max_output_tokens)
         return self._context_window - output_reserve
 
-    def get_allocation(self) -> BudgetAllocation:
-        """获取预算分配"""
+    def _compute_allocation(self) -> BudgetAllocation:
+        """计算预算分配 / Compute the allocation from ratios and the total budget."""
         total = self._total_budget
 
         # 按比例分配（不含 output_reserve，因为已经扣除）
@@ -174,6 +207,15 @@ class ContextBudgetManager:
 
         return allocation
 
+    def get_allocation(self) -> BudgetAllocation:
+        """
+        获取预算分配 / Get the budget allocation.
+
+        Inputs are fixed after construction, so the allocation is computed once
+        in __init__ and returned as a copy to keep the cached instance intact.
+        """
+        return replace(self._allocation)
+
     def allocate_for_agent(self, agent_name: str) -> Dict[str, int]:
         """
         为特定 Agent 分配预算
@@ -183,41 +225,21 @@ class ContextBudgetManager:
         - writer: 需要更多 current_draft 和 summaries
         - editor: 需要更多 current_draft
         """
-        base = self.get_allocation()
-
-        # Agent 特定调整
-        adjustments = {
-            "archivist": {
-                "cards": 1.2,
-                "canon": 1.3,
-                "summaries": 0.8,
-                "current_draft": 0.7,
-            },
-            "writer": {
-                "cards": 1.0,
-                "canon": 1.0,
-                "summaries": 1.2,
-                "current_draft": 1.1,
-            },
-            "editor": {
-                "cards": 0.8,
-                "canon": 0.8,
-                "summaries": 0.9,
-                "current_draft": 1.3,
-            },
-        }
-
-        adj = adjustments.get(agent_name, {})
-
-        return {
-            "system_rules": base.system_rules,
-            "cards": int(base.cards * adj.get("cards", 1.0)),
-            "canon": int(base.canon * adj.get("canon", 1.0)),
-            "summaries": int(base.summaries * adj.get("summaries", 1.0)),
-            "current_draft": int(base.current_draft * adj.get("current_draft", 1.0)),
-            "total_available": base.total_available,
-            "output_reserve": base.output_reserve,
-        }
+        cached = self._agent_allocations.get(agent_name)
+        if cached is None:
+            base = self._allocation
+            adj = _AGENT_BUDGET_ADJUSTMENTS.get(agent_name, {})
+            cached = {
+                "system_rules": base.system_rules,
+                "cards": int(base.cards * adj.get("cards", 1.0)),
+                "canon": int(base.canon * adj.get("canon", 1.0)),
+                "summaries": int(base.summaries * adj.get("summaries", 1.0)),
+                "current_draft": int(base.current_draft * adj.get("current_draft", 1.0)),
+                "total_available": base.total_available,
+                "output_reserve": base.output_reserve,
+            }
+            self._agent_allocations[agent_name] = cached
+        return dict(cached)
 
     def track_usage(self, category: str, content: str, items_count: int = 1) -> BudgetUsage:
         """
@@ -232,27 +254,26 @@ class ContextBudgetManager:
             使用情况
         """
         tokens = count_tokens(content)
-        allocation = self.get_allocation()
+        allocated = self._allocated.get(category, 0)
 
-        allocated = getattr(allocation, category, 0)
-
-        if category not in self._usage:
-            self._usage[category] = BudgetUsage(
+        usage = self._usage.get(category)
+        if usage is None:
+            usage = self._usage[category] = BudgetUsage(
                 category=category,
                 allocated=allocated,
                 used=0,
                 items_count=0,
             )
 
-        self._usage[category].used += tokens
-        self._usage[category].items_count += items_count
+        usage.used += tokens
+        usage.items_count += items_count
+        self._total_used += tokens
 
-        return self._usage[category]
+        return usage
 
     def get_usage_summary(self) -> Dict[str, Any]:
         """获取使用情况摘要"""
-        allocation = self.get_allocation()
-        total_used = sum(u.used for u in self._usage.values())
+        total_used = self._total_used
 
         return {
             "model": self.model_name,
@@ -275,8 +296,7 @@ class ContextBudgetManager:
     def can_fit(self, content: str, category: str) -> bool:
         """检查内容是否能放入指定类别的预算"""
         tokens = count_tokens(content)
-        allocation = self.get_allocation()
-        allocated = getattr(allocation, category, 0)
+        allocated = self._allocated.get(category, 0)
 
         current_usage = self._usage.get(category)
         used = current_usage.used if current_usage else 0
@@ -285,8 +305,7 @@ class ContextBudgetManager:
 
     def get_remaining(self, category: str) -> int:
         """获取指定类别的剩余预算"""
-        allocation = self.get_allocation()
-        allocated = getattr(allocation, category, 0)
+        allocated = self._allocated.get(category, 0)
 
         current_usage = self._usage.get(category)
         used = current_usage.used if current_usage else 0
@@ -320,11 +339,42 @@ def create_budget_manager(
     Returns:
         ContextBudgetManager 实例
     """
+    model, max_tokens = _resolve_budget_inputs(profile, model_name, max_output_tokens)
+    return ContextBudgetManager(model_name=model, max_output_tokens=max_tokens)
+
+
+def _resolve_budget_inputs(
+    profile: Optional[Dict[str, Any]],
+    model_name: Optional[str],
+    max_output_tokens: int,
+) -> Tuple[Optional[str], int]:
+    """从 profile 或显式参数解析模型名与输出上限 / Resolve model name and output limit."""
     if profile:
-        model = profile.get("model", model_name)
-        max_tokens = profile.get("max_tokens", max_output_tokens)
-    else:
-        model = model_name
-        max_tokens = max_output_tokens
+        return profile.get("model", model_name), profile.get("max_tokens", max_output_tokens)
+    return model_name, max_output_tokens
 
-    return ContextBudgetManager(model_name=model, max_output_tokens=max_tokens)
+
+@lru_cache(maxsize=32)
+def _allocation_manager(model_name: Optional[str], max_output_tokens: int) -> ContextBudgetManager:
+    """只读共享的预算管理器（不做用量追踪） / Shared, read-only manager (never used for usage tracking)."""
+    return ContextBudgetManager(model_name=model_name, max_output_tokens=max_output_tokens)
+
+
+def get_agent_allocation(
+    agent_name: str,
+    profile: Optional[Dict[str, Any]] = None,
+    model_name: Optional[str] = None,
+    max_output_tokens: int = 8000,
+) -> Dict[str, int]:
+    """
+    获取指定 Agent 的预算分配（按模型与输出上限缓存）
+
+    分配只取决于模型、输出上限与启动时加载的比例，无需每次请求新建管理器。
+    The allocation depends only on the model, the output limit and the ratios loaded at
+    import, so one manager per (model, max tokens) is reused instead of building one per call.
+
+    Returns:
+        与 ContextBudgetManager.allocate_for_agent 相同结构的副本
+    """
+    model, max_tokens = _resolve_budget_inputs(profile, model_name, max_output_tokens)
+    return _allocation_manager(model, max_tokens).allocate_for_agent(agent_name)
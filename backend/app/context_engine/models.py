@@ -5,6 +5,7 @@ Core data structures for the context engineering system
 """
 
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import List, Dict, Any, Optional
 from enum import Enum
 from datetime import datetime
@@ -57,7 +58,7 @@ class DegradationType(str, Enum):
     CLASH = "clash"               # 冲突：信息自相矛盾
 
 
-@dataclass
+@dataclass(slots=True)
 class ContextItem:
     """
     单个上下文项
@@ -154,6 +155,35 @@ class ToolDefinition:
         return f"**{self.name}**: {self.description}"
 
 
+# ToolTrace 结果预览长度 / Length of ToolTrace result previews
+_RESULT_PREVIEW_CHARS = 100
+
+
+def _result_preview(result: Any) -> str:
+    """
+    与 str(result)[:100] 相同的预览；普通 dict/list 拼够长度即停止格式化剩余元素
+    Same text as str(result)[:100]; plain dicts/lists stop formatting items once the preview is full.
+    """
+    if type(result) is dict:
+        opener, closer, items = "{", "}", (f"{k!r}: {v!r}" for k, v in result.items())
+    elif type(result) is list:
+        opener, closer, items = "[", "]", map(repr, result)
+    else:
+        return str(result)[:_RESULT_PREVIEW_CHARS]
+    parts = [opener]
+    size = len(opener)
+    for index, item in enumerate(items):
+        if index:
+            parts.append(", ")
+            size += 2
+        parts.append(item)
+        size += len(item)
+        if size >= _RESULT_PREVIEW_CHARS:
+            return "".join(parts)[:_RESULT_PREVIEW_CHARS]
+    parts.append(closer)
+    return "".join(parts)[:_RESULT_PREVIEW_CHARS]
+
+
 @dataclass
 class ToolTrace:
     """
@@ -171,11 +201,11 @@ class ToolTrace:
     def to_context_string(self) -> str:
         """Convert to string for context inclusion"""
         status = "✓" if self.success else "✗"
-        result_preview = str(self.result)[:100] if self.result else ""
+        result_preview = _result_preview(self.result) if self.result else ""
         return f"{status} {self.tool_name}({self.arguments}) → {result_preview}"
 
 
-@dataclass
+@dataclass(slots=True)
 class HealthCheckResult:
     """
     上下文健康检查结果
@@ -200,8 +230,9 @@ class AssembledContext:
     health: HealthCheckResult      # 健康检查结果
     items: List[ContextItem]       # 原始上下文项（用于追踪）
     
-    @property
+    @cached_property
     def total_tokens(self) -> int:
+        """组装完成后 items 不再变化，总量只计算一次 / Items are fixed after assembly; summed once."""
         return sum(item.token_count for item in self.items)
     
     def to_messages(self) -> List[Dict[str, str]]:
@@ -14,13 +14,22 @@ License: PolyForm Noncommercial License 1.0.0
 """
 
 from typing import List, Optional, Dict, Any
+import asyncio
+import heapq
 import math
+from operator import attrgetter
 from .models import ContextItem, ContextPriority, ContextType
 from .text_tokenizer import calculate_overlap_score, calculate_bm25_score
+from app.schemas.card import CharacterCard, StyleCard, WorldCard
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 字段均为标量/字符串列表的卡片模型：按声明顺序直接读取属性，免去 model_dump 的整份拷贝
+# Card schemas whose fields are all scalars or lists of strings. Their attributes are read
+# directly in declaration order, which matches model_dump(exclude_none=True) without the copy.
+_FLAT_CARD_FIELDS = {cls: tuple(cls.model_fields) for cls in (CharacterCard, WorldCard, StyleCard)}
+
 
 class ContextSelectEngine:
     """
@@ -48,6 +57,13 @@ class ContextSelectEngine:
     # 确定性选择：必须加载的关键项 / Deterministic Selection: Critical items
     # ========================================================================
 
+    # 各智能体必须加载的项目类型 / Item types each agent always loads
+    ALWAYS_LOAD_MAP = {
+        "archivist": ("style_card",),
+        "writer": ("style_card", "scene_brief"),
+        "editor": ("style_card",),
+    }
+
     async def deterministic_select(self, project_id: str, agent_name: str, storage: Any) -> List[ContextItem]:
         """
         确定性选择 - 加载特定智能体必须使用的项 / Deterministic selection for critical items.
@@ -64,14 +80,7 @@ class ContextSelectEngine:
             关键上下文项列表 / List of critical ContextItems.
         """
         items = []
-        always_load_map = {
-            "archivist": ["style_card"],
-            "writer": ["style_card", "scene_brief"],
-            "editor": ["style_card"],
-        }
-
-        item_types = always_load_map.get(agent_name, [])
-        for item_type in item_types:
+        for item_type in self.ALWAYS_LOAD_MAP.get(agent_name, ()):
             item = await self._load_item(project_id, item_type, storage)
             if item:
                 item.priority = ContextPriority.CRITICAL
@@ -114,6 +123,9 @@ class ContextSelectEngine:
         Returns:
             格式化的字符串 / Formatted string representation.
         """
+        flat_fields = _FLAT_CARD_FIELDS.get(type(card))
+        if flat_fields is not None:
+            return "\n".join(f"{k}: {v}" for k in flat_fields if (v := getattr(card, k)))
         if hasattr(card, "model_dump"):
             try:
                 payload = card.model_dump(exclude_none=True)
@@ -133,6 +145,9 @@ class ContextSelectEngine:
     # 每种类型最大候选加载数量，防止内存膨胀
     MAX_CANDIDATES_PER_TYPE = 50
 
+    # 检索式选择支持的项目类型 / Item types supported by retrieval selection
+    RETRIEVAL_ITEM_TYPES = frozenset({"character", "world", "fact", "text_chunk"})
+
     async def retrieval_select(
         self,
         project_id: str,
@@ -165,12 +180,12 @@ class ContextSelectEngine:
         if top_k <= 0:
             return []
 
-        item_types = [str(t or "").strip().lower() for t in (item_types or []) if str(t or "").strip()]
+        # 只保留支持的类型；若一个都没有，则在任何存储 I/O 之前返回
+        # Keep only supported types so unknown-only requests return before any storage I/O.
+        item_types = {str(t or "").strip().lower() for t in (item_types or [])} & self.RETRIEVAL_ITEM_TYPES
         if not item_types:
             return []
 
-        candidates: List[ContextItem] = []
-
         def score_text(text: str) -> float:
             text = str(text or "").strip()
             if not text:
@@ -187,71 +202,50 @@ class ContextSelectEngine:
             # bm25 stabilizes for longer contexts.
             return float(overlap) * 0.35 + float(bm25) * 0.65
 
-        # Character cards / 角色卡
-        if "character" in item_types:
+        async def card_candidates(
+            kind: str, list_attr: str, get_attr: str, context_type: ContextType, id_prefix: str
+        ) -> List[ContextItem]:
             try:
-                names = await storage.list_character_cards(project_id)
+                names = await getattr(storage, list_attr)(project_id)
             except Exception as exc:
-                logger.warning("Failed to list character cards: %s", exc)
+                logger.warning("Failed to list %s cards: %s", kind, exc)
                 names = []
-            for name in (names or [])[: self.MAX_CANDIDATES_PER_TYPE]:
-                try:
-                    card = await storage.get_character_card(project_id, name)
-                except Exception:
-                    card = None
-                if not card:
-                    continue
-                content = self._format_card(card)
-                s = score_text(content)
-                if s <= 0:
-                    continue
-                candidates.append(
-                    ContextItem(
-                        id=f"char_{name}",
-                        type=ContextType.CHARACTER_CARD,
-                        content=content,
-                        priority=ContextPriority.MEDIUM,
-                        relevance_score=s,
-                        metadata={"name": name},
-                    )
-                )
-
-        # World cards / 世界观卡
-        if "world" in item_types:
+            names = (names or [])[: self.MAX_CANDIDATES_PER_TYPE]
+            if not names:
+                return []
+            # 并发读取各卡片，单张失败按缺失处理 / Fetch cards concurrently; a failed read counts as missing
             try:
-                names = await storage.list_world_cards(project_id)
-            except Exception as exc:
-                logger.warning("Failed to list world cards: %s", exc)
-                names = []
-            for name in (names or [])[: self.MAX_CANDIDATES_PER_TYPE]:
-                try:
-                    card = await storage.get_world_card(project_id, name)
-                except Exception:
-                    card = None
-                if not card:
+                get_card = getattr(storage, get_attr)
+                cards = await asyncio.gather(*(get_card(project_id, name) for name in names), return_exceptions=True)
+            except Exception:
+                return []
+            items: List[ContextItem] = []
+            for name, card in zip(names, cards):
+                if isinstance(card, BaseException) or not card:
                     continue
                 content = self._format_card(card)
                 s = score_text(content)
                 if s <= 0:
                     continue
-                candidates.append(
+                items.append(
                     ContextItem(
-                        id=f"world_{name}",
-                        type=ContextType.WORLD_CARD,
+                        id=f"{id_prefix}_{name}",
+                        type=context_type,
                         content=content,
                         priority=ContextPriority.MEDIUM,
                         relevance_score=s,
                         metadata={"name": name},
                     )
                 )
+            return items
 
-        # Canon facts / 事实
-        if "fact" in item_types:
+        async def fact_candidates() -> List[ContextItem]:
             try:
                 facts = await storage.get_all_facts(project_id)
             except Exception as exc:
                 logger.warning("Failed to load facts: %s", exc)
                 facts = []
+            items: List[ContextItem] = []
             for idx, fact in enumerate((facts or [])[: self.MAX_CANDIDATES_PER_TYPE]):
                 try:
                     statement = str(getattr(fact, "statement", "") or "").strip()
@@ -264,7 +258,7 @@ class ContextSelectEngine:
                 s = score_text(statement)
                 if s <= 0:
                     continue
-                candidates.append(
+                items.append(
                     ContextItem(
                         id=fact_id,
                         type=ContextType.FACT,
@@ -274,14 +268,15 @@ class ContextSelectEngine:
                         metadata={"introduced_in": introduced_in},
                     )
                 )
+            return items
 
-        # Text chunks / 正文片段
-        if "text_chunk" in item_types:
+        async def text_chunk_candidates() -> List[ContextItem]:
             try:
                 chunks = await storage.search_text_chunks(project_id, query, limit=self.MAX_CANDIDATES_PER_TYPE)
             except Exception as exc:
                 logger.warning("Failed to search text chunks: %s", exc)
                 chunks = []
+            items: List[ContextItem] = []
             for idx, chunk in enumerate(chunks or []):
                 if not isinstance(chunk, dict):
                     continue
@@ -291,7 +286,7 @@ class ContextSelectEngine:
                 s = score_text(text)
                 if s <= 0:
                     continue
-                candidates.append(
+                items.append(
                     ContextItem(
                         id=f"text_{idx}",
                         type=ContextType.TEXT_CHUNK,
@@ -301,9 +296,33 @@ class ContextSelectEngine:
                         metadata={"source": chunk.get("source") or {}, "chapter": chunk.get("chapter")},
                     )
                 )
+            return items
+
+        # 各类型候选互不依赖，并发加载；按固定类型顺序合并以保持同分项的排序稳定
+        # Candidate types are independent, so load them concurrently; merge in a fixed type
+        # order so ties keep a stable ranking.
+        loaders = []
+        if "character" in item_types:
+            loaders.append(
+                card_candidates(
+                    "character", "list_character_cards", "get_character_card", ContextType.CHARACTER_CARD, "char"
+                )
+            )
+        if "world" in item_types:
+            loaders.append(
+                card_candidates("world", "list_world_cards", "get_world_card", ContextType.WORLD_CARD, "world")
+            )
+        if "fact" in item_types:
+            loaders.append(fact_candidates())
+        if "text_chunk" in item_types:
+            loaders.append(text_chunk_candidates())
+
+        candidates: List[ContextItem] = [item for group in await asyncio.gather(*loaders) for item in group]
 
         if not candidates:
             return []
 
-        candidates.sort(key=lambda item: float(item.relevance_score or 0.0), reverse=True)
-        return candidates[:top_k]
+        # score_text() always yields a positive float here, so rank on the field directly.
+        # nlargest keeps only top_k in a heap (O(N log k)) and matches a stable descending sort on ties.
+        # 候选分数均为 score_text() 返回的正浮点数，可直接按字段取前 top_k。
+        return heapq.nlargest(top_k, candidates, key=attrgetter("relevance_score"))
@@ -54,27 +54,19 @@ def split_sentences(text: str) -> List[str]:
     if not text:
         return []
 
-    # 使用正则分割
+    # 单次扫描：split 带一个捕获组，偶数位为正文、奇数位为分隔符，
+    # 分隔符直接附在其前面的正文后，无需逐段重新匹配或拼接累加
     parts = _SENTENCE_PATTERN.split(text)
-
     sentences = []
-    current = ""
-
-    for part in parts:
-        if not part:
-            continue
-        if _SENTENCE_PATTERN.match(part):
-            # 这是分隔符，附加到当前句子
-            current += part
-            if current.strip():
-                sentences.append(current.strip())
-            current = ""
-        else:
-            current += part
+    for i in range(0, len(parts) - 1, 2):
+        sentence = (parts[i] + parts[i + 1]).strip()
+        if sentence:
+            sentences.append(sentence)
 
     # 处理最后一个句子
-    if current.strip():
-        sentences.append(current.strip())
+    tail = parts[-1].strip()
+    if tail:
+        sentences.append(tail)
 
     return sentences
 
@@ -208,11 +200,8 @@ def smart_compress(
     head_end = head_sentences[-1][0] if head_sentences else -1
     tail_start = tail_sentences[0][0] if tail_sentences else len(sentences)
 
-    middle_candidates = [
-        (i, sentence, score)
-        for i, sentence, score in scored_sentences
-        if head_end < i < tail_start
-    ]
+    # scored_sentences 的下标即句子序号，中间区间直接切片，无需逐句比较
+    middle_candidates = scored_sentences[head_end + 1:tail_start]
 
     # 按分数排序
     middle_candidates.sort(key=lambda x: x[2], reverse=True)
@@ -227,24 +216,23 @@ def smart_compress(
     # 按原始顺序排序中间句子
     middle_sentences.sort(key=lambda x: x[0])
 
-    # 组装结果
-    result_parts = []
+    # 组装结果：所有片段平铺进同一列表，只做一次 join，不生成分段中间串
+    result_parts: List[str] = []
 
     # 添加开头
-    if head_sentences:
-        result_parts.append("".join(s for _, s in head_sentences))
+    result_parts.extend(s for _, s in head_sentences)
 
     # 添加省略标记和中间句子
     if middle_sentences:
         if head_sentences:
             result_parts.append("\n[...]\n")
-        result_parts.append("".join(s for _, s in middle_sentences))
+        result_parts.extend(s for _, s in middle_sentences)
 
     # 添加省略标记和结尾
     if tail_sentences:
         if middle_sentences or head_sentences:
             result_parts.append("\n[...]\n")
-        result_parts.append("".join(s for _, s in tail_sentences))
+        result_parts.extend(s for _, s in tail_sentences)
 
     compressed = "".join(result_parts)
 
@@ -18,7 +18,8 @@ License: PolyForm Noncommercial License 1.0.0
 """
 
 import re
-from typing import List, Set
+from collections import Counter
+from typing import List, Set, Tuple
 from functools import lru_cache
 
 # 尝试导入 jieba / Try to import jieba
@@ -101,7 +102,15 @@ def tokenize(text: str, remove_stopwords: bool = True) -> List[str]:
     """
     if not text:
         return []
+    return list(_tokenize_cached(text, remove_stopwords))
 
+
+@lru_cache(maxsize=1024)
+def _tokenize_cached(text: str, remove_stopwords: bool) -> Tuple[str, ...]:
+    """
+    分词结果缓存：检索时同一查询和卡片内容会被反复分词
+    Memoized tokenization; retrieval re-tokenizes the same query and card contents on every candidate/call.
+    """
     text_lower = text.lower()
     tokens = []
 
@@ -129,9 +138,7 @@ def tokenize(text: str, remove_stopwords: bool = True) -> List[str]:
         tokens = [t for t in tokens if t not in _CHINESE_STOPWORDS and t not in _ENGLISH_STOPWORDS]
 
     # 移除单字符（除了数字）
-    tokens = [t for t in tokens if len(t) > 1 or t.isdigit()]
-
-    return tokens
+    return tuple(t for t in tokens if len(t) > 1 or t.isdigit())
 
 
 def _simple_cjk_tokenize(text: str) -> List[str]:
@@ -224,9 +231,12 @@ def calculate_overlap_score(query: str, content: str) -> float:
     base_score = overlap / len(query_tokens)
 
     # 加权：如果内容包含完整的查询 token，给予额外分数
+    # 内容只转小写一次；已在内容 token 集合中的词必然是其子串，可跳过子串查找
+    # Lowercase content once; tokens already in content_tokens are substrings of it, so skip the scan.
+    content_lower = content.lower()
     exact_match_bonus = 0.0
     for token in query_tokens:
-        if token in content.lower():
+        if token in content_tokens or token in content_lower:
             exact_match_bonus += 0.1
 
     return min(1.0, base_score + exact_match_bonus)
@@ -269,13 +279,13 @@ def calculate_bm25_score(
         return 0.0
 
     doc_length = len(content_tokens)
-    content_token_set = set(content_tokens)
+    # 一次计数得到全部词频，避免逐词 list.count 的 O(Q·D) 扫描
+    term_freqs = Counter(content_tokens)
 
     score = 0.0
     for token in query_tokens:
-        if token in content_token_set:
-            # 简化的 TF 计算
-            tf = content_tokens.count(token)
+        tf = term_freqs.get(token)
+        if tf:
             # BM25 公式
             numerator = tf * (k1 + 1)
             denominator = tf + k1 * (1 - b + b * (doc_length / avg_doc_length))
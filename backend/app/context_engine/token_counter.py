@@ -18,6 +18,8 @@ License: PolyForm Noncommercial License 1.0.0
 """
 
 import re
+from collections import OrderedDict
+from hashlib import blake2b
 from typing import Optional
 from functools import lru_cache
 from app.utils.logger import get_logger
@@ -37,8 +39,11 @@ except ImportError:
     logger.info("tiktoken 不可用，使用估算方案 / tiktoken not available, using estimation fallback")
 
 
-# 中文字符正则 / CJK character pattern
-_CJK_PATTERN = re.compile(r'[\u4e00-\u9fff\u3400-\u4dbf\u20000-\u2a6df\u2a700-\u2b73f]')
+# 连续中文字符段正则：按段匹配比逐字匹配少得多的 match 对象
+# CJK run pattern: matching whole runs creates far fewer match objects than per-character matching.
+# 扩展区 B/C 需要 \U 八位转义，\u20000 会被解析成 U+2000 加字符 "0"，把 ASCII 也算进中文
+# Extension B/C need 8-digit \U escapes; \u20000 parses as U+2000 plus "0" and swept ASCII into the CJK class
+_CJK_PATTERN = re.compile(r'[\u4e00-\u9fff\u3400-\u4dbf\U00020000-\U0002a6df\U0002a700-\U0002b73f]+')
 
 
 def count_tokens(text: str, use_cache: bool = True) -> int:
@@ -65,7 +70,15 @@ def count_tokens(text: str, use_cache: bool = True) -> int:
     """
     if not text:
         return 0
+    if not use_cache:
+        return _count_tokens_uncached(text)
+    if len(text) <= _LONG_TEXT_CHARS:
+        return _count_tokens_cached(text)
+    return _count_long_tokens_cached(text)
 
+
+def _count_tokens_uncached(text: str) -> int:
+    """计算token数量（不使用缓存） / Count tokens without the cache."""
     if _tiktoken_available and _encoding:
         try:
             return len(_encoding.encode(text))
@@ -75,6 +88,31 @@ def count_tokens(text: str, use_cache: bool = True) -> int:
     return _estimate_tokens_mixed(text)
 
 
+# 相同文本（系统提示、卡片描述等）在预算检查中被反复计数，按内容缓存结果
+# Identical blocks (system prompts, card text) are re-counted on every budget check; memoize by content
+_count_tokens_cached = lru_cache(maxsize=4096)(_count_tokens_uncached)
+
+# 长文本（章节正文等）按摘要缓存，避免缓存长期持有整段字符串
+# Long texts (chapter bodies etc.) are cached by digest so the cache does not pin whole strings
+_LONG_TEXT_CHARS = 4096
+_LONG_TEXT_CACHE_SIZE = 256
+_long_text_counts: "OrderedDict[bytes, int]" = OrderedDict()
+
+
+def _count_long_tokens_cached(text: str) -> int:
+    """按内容摘要缓存长文本计数 / Count long text, memoized by content digest."""
+    key = blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    cached = _long_text_counts.get(key)
+    if cached is not None:
+        _long_text_counts.move_to_end(key)
+        return cached
+    tokens = _count_tokens_uncached(text)
+    _long_text_counts[key] = tokens
+    if len(_long_text_counts) > _LONG_TEXT_CACHE_SIZE:
+        _long_text_counts.popitem(last=False)
+    return tokens
+
+
 def _estimate_tokens_mixed(text: str) -> int:
     """
     混合语言的token估算
@@ -96,7 +134,8 @@ def _estimate_tokens_mixed(text: str) -> int:
     if not text:
         return 0
 
-    cjk_chars = len(_CJK_PATTERN.findall(text))
+    # 纯 ASCII 文本无需正则扫描 / Pure ASCII text needs no regex scan
+    cjk_chars = 0 if text.isascii() else sum(map(len, _CJK_PATTERN.findall(text)))
     other_chars = len(text) - cjk_chars
 
     # 中文按 1.5 字符/token，英文按 4 字符/token
@@ -4,8 +4,10 @@ Records and streams agent execution events for visualization
 记录并推送 Agent 执行事件供可视化
 """
 
+from collections import deque
 from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Any, Optional, Callable
+from itertools import islice
+from typing import List, Dict, Any, Optional, Callable, Deque
 from enum import Enum
 from datetime import datetime
 import asyncio
@@ -138,7 +140,8 @@ class TraceCollector:
     
     def __init__(self, max_history: int = 1000):
         self.max_history = max_history
-        self.events: List[TraceEvent] = []
+        # 环形缓冲：超出上限时自动淘汰最旧事件 / Ring buffer: oldest events drop off in O(1)
+        self.events: Deque[TraceEvent] = deque(maxlen=max_history)
         self.agent_traces: Dict[str, AgentTrace] = {}
         self.subscribers: List[Callable] = []
         self._event_counter = 0
@@ -160,6 +163,12 @@ class TraceCollector:
                 "issues": []
             }
         }
+        # 统计版本号：current_stats 每次变更递增，供推送端判断是否需要重发
+        # Stats revision: bumped on every current_stats change so pushers can skip resends
+        self.stats_revision = 0
+        # 已登记的健康问题类型，避免每次更新都扫描 issues 列表
+        # Issue types already reported, so updates don't rescan the issues list
+        self._health_issue_types: set = set()
     
     def _generate_id(self) -> str:
         """生成事件 ID"""
@@ -197,10 +206,6 @@ class TraceCollector:
             
             self.events.append(event)
             
-            # 限制历史数量
-            if len(self.events) > self.max_history:
-                self.events = self.events[-self.max_history:]
-            
             # 更新 Agent 追踪
             if agent_name in self.agent_traces:
                 self.agent_traces[agent_name].add_event(event)
@@ -409,6 +414,7 @@ class TraceCollector:
     ):
         """Update global token stats"""
         async with self._lock:
+            self.stats_revision += 1
             # Update total
             self.current_stats["token_usage"]["total"] += total_delta
             
@@ -422,12 +428,12 @@ class TraceCollector:
             usage_ratio = self.current_stats["token_usage"]["total"] / self.current_stats["token_usage"]["max"]
             self.current_stats["health"]["healthy"] = usage_ratio < 0.9
             
-            if usage_ratio >= 0.9:
-                if "High Token Load" not in [i["type"] for i in self.current_stats["health"]["issues"]]:
-                     self.current_stats["health"]["issues"].append({
-                         "type": "High Token Load",
-                         "message": "Token usage is approaching limit."
-                     })
+            if usage_ratio >= 0.9 and "High Token Load" not in self._health_issue_types:
+                self._health_issue_types.add("High Token Load")
+                self.current_stats["health"]["issues"].append({
+                    "type": "High Token Load",
+                    "message": "Token usage is approaching limit."
+                })
             
     def get_current_stats(self) -> Dict[str, Any]:
         """Get current global stats"""
@@ -459,7 +465,8 @@ class TraceCollector:
     
     def get_recent_events(self, count: int = 50) -> List[Dict]:
         """获取最近的事件"""
-        return [e.to_dict() for e in self.events[-count:]]
+        start = max(0, len(self.events) - count)
+        return [e.to_dict() for e in islice(self.events, start, None)]
     
     def get_agent_trace(self, agent_name: str) -> Optional[Dict]:
         """获取 Agent 追踪"""
@@ -11,7 +11,7 @@ License: PolyForm Noncommercial License 1.0.0
   LLM Error Classification - Classifies errors as retryable or non-retryable for intelligent retry handling.
 """
 
-from typing import Tuple
+from typing import Optional, Tuple
 
 
 # Error message patterns for classification
@@ -200,3 +200,35 @@ def get_retry_delay(attempt: int, base_delays: list = None, max_delay: float = 6
     jitter = delay * random.uniform(0, 0.1)
 
     return delay + jitter
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """
+    读取错误响应中的 Retry-After 头
+
+    Read the Retry-After hint (seconds) from a provider HTTP error, if present.
+
+    SDK status errors (openai/anthropic) expose the raw ``response``; only the
+    numeric-seconds form of the header is honored.
+
+    Args:
+        error: 要检查的异常 / The exception to inspect
+
+    Returns:
+        建议等待秒数或None / Suggested wait in seconds, or None
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after")
+    except Exception:
+        return None
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    return seconds if seconds >= 0 else None
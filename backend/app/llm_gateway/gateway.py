@@ -11,7 +11,7 @@ from typing import List, Dict, Any, Optional
 import app.config as app_config
 from app.utils.logger import get_logger
 from app.services.llm_config_service import llm_config_service
-from app.llm_gateway.errors import classify_error, get_retry_delay
+from app.llm_gateway.errors import classify_error, get_retry_after, get_retry_delay
 from app.llm_gateway.providers import (
     BaseLLMProvider,
     OpenAIProvider,
@@ -48,6 +48,11 @@ class LLMGateway:
         self.retry_delays = [1, 2, 4, 8, 16]  # Exponential backoff / 指数退避
         self.max_retry_delay = 60.0  # Maximum delay cap / 最大延迟上限
 
+        # Concurrency limit / 并发上限：避免并发章节请求超出提供商 RPM/TPM
+        llm_cfg = app_config.config.get("llm", {}) or {}
+        self.max_concurrency = max(1, int(llm_cfg.get("max_concurrency", 8) or 8))
+        self._concurrency = asyncio.Semaphore(self.max_concurrency)
+
         # Cost tracking / 成本追踪
         self.total_tokens = 0
         self.total_requests = 0
@@ -191,6 +196,26 @@ class LLMGateway:
             return None
         return None
     
+    def _resolve_provider(self, provider: str) -> Optional[BaseLLMProvider]:
+        """
+        按 profile ID 解析提供商，兼容旧式提供商类型名 / Resolve a provider by profile ID,
+        falling back to legacy provider type names such as 'openai'.
+        """
+        if provider and provider not in self.providers:
+            # 运行期新增 profile 的兼容：按需加载一次
+            self._try_load_profile_by_id(provider)
+
+        target_provider = self.providers.get(provider)
+        if target_provider is not None:
+            return target_provider
+
+        # Fallback: maybe it's a legacy string like 'openai'? Use the first profile of that type.
+        # 所有提供商都继承 BaseLLMProvider.get_provider_name，无需逐个 hasattr 探测
+        for candidate in self.providers.values():
+            if candidate.get_provider_name() == provider:
+                return candidate
+        return None
+
     async def chat(
         self,
         messages: List[Dict[str, str]],
@@ -211,22 +236,7 @@ class LLMGateway:
         # We should handle backward compatibility or ensure caller passes profile ID.
         # Actually, caller usually passes result of get_provider_for_agent()
         
-        target_provider = None
-
-        if provider and provider not in self.providers:
-            # 运行期新增 profile 的兼容：按需加载一次
-            self._try_load_profile_by_id(provider)
-
-        if provider in self.providers:
-            target_provider = self.providers[provider]
-        else:
-            # Fallback: maybe it's a legacy string like 'openai'?
-            # Try to find first profile of that type?
-            for pid, p in self.providers.items():
-                if hasattr(p, 'get_provider_name') and p.get_provider_name() == provider:
-                    target_provider = p
-                    break
-             
+        target_provider = self._resolve_provider(provider)
         if not target_provider:
              raise ValueError(f"Profile/Provider '{provider}' not found.")
         
@@ -287,6 +297,9 @@ class LLMGateway:
                         self.retry_delays,
                         self.max_retry_delay
                     )
+                    retry_after = get_retry_after(e)
+                    if retry_after is not None:
+                        delay = min(max(delay, retry_after), self.max_retry_delay)
                     logger.info("Retrying in %.1f seconds...", delay)
                     await asyncio.sleep(delay)
 
@@ -305,9 +318,12 @@ class LLMGateway:
         max_tokens: Optional[int]
     ) -> Dict[str, Any]:
         """Execute single chat request"""
-        start_time = time.time()
-        response = await provider.chat(messages, temperature=temperature, max_tokens=max_tokens)
-        elapsed_time = time.time() - start_time
+        async with self._concurrency:
+            start_time = time.time()
+            response = await provider.chat(
+                provider.prepare_messages(messages), temperature=temperature, max_tokens=max_tokens
+            )
+            elapsed_time = time.time() - start_time
 
         self.total_requests += 1
         self.total_tokens += response.get("usage", {}).get("total_tokens", 0)
@@ -357,23 +373,16 @@ class LLMGateway:
             String chunks as they arrive from the LLM
         """
         # Resolve provider
-        target_provider = None
-        if provider and provider not in self.providers:
-            self._try_load_profile_by_id(provider)
-        if provider in self.providers:
-            target_provider = self.providers[provider]
-        else:
-            for pid, p in self.providers.items():
-                if hasattr(p, 'get_provider_name') and p.get_provider_name() == provider:
-                    target_provider = p
-                    break
-        
+        target_provider = self._resolve_provider(provider)
         if not target_provider:
             raise ValueError(f"Profile/Provider '{provider}' not found.")
         
-        # Delegate to provider's stream_chat
-        async for chunk in target_provider.stream_chat(messages, temperature, max_tokens):
-            yield chunk
+        # Delegate to provider's stream_chat; the slot is held for the whole stream
+        async with self._concurrency:
+            async for chunk in target_provider.stream_chat(
+                target_provider.prepare_messages(messages), temperature, max_tokens
+            ):
+                yield chunk
     
     def get_provider_for_agent(self, agent_name: str) -> str:
         """
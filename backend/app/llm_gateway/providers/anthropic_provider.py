@@ -11,9 +11,9 @@ License: PolyForm Noncommercial License 1.0.0
   Anthropic (Claude) Provider - Implements BaseLLMProvider for Claude API
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncGenerator, Tuple
 from anthropic import AsyncAnthropic
-from app.llm_gateway.providers.base import BaseLLMProvider
+from app.llm_gateway.providers.base import BaseLLMProvider, CACHE_CONTROL_KEY
 
 
 class AnthropicProvider(BaseLLMProvider):
@@ -22,11 +22,14 @@ class AnthropicProvider(BaseLLMProvider):
 
     Implements the LLM provider interface for Anthropic's Claude models.
     Handles system message extraction and proper message formatting for Claude.
+    Messages tagged with ``cache_control`` are sent as cacheable content blocks.
 
     Attributes:
         client (AsyncAnthropic): 异步 Anthropic 客户端 / Async Anthropic client instance.
     """
 
+    supports_prompt_cache = True
+
     def __init__(
         self,
         api_key: str,
@@ -67,32 +70,7 @@ class AnthropicProvider(BaseLLMProvider):
         Returns:
             响应字典包含内容、使用统计等 / Response dict with content, usage, etc.
         """
-        # ========================================================================
-        # 提取系统消息（如存在） / Extract system message if present
-        # ========================================================================
-        system_message = None
-        filtered_messages = []
-
-        for msg in messages:
-            if msg["role"] == "system":
-                system_message = msg["content"]
-            else:
-                filtered_messages.append(msg)
-
-        # ========================================================================
-        # Anthropic API调用 / Anthropic API call
-        # ========================================================================
-        kwargs = {
-            "model": self.model,
-            "messages": filtered_messages,
-            "temperature": temperature or self.temperature,
-            "max_tokens": max_tokens or self.max_tokens
-        }
-
-        # Claude expects system prompt as separate parameter, not in messages list
-        if system_message:
-            kwargs["system"] = system_message
-
+        kwargs = self._build_request(messages, temperature, max_tokens)
         response = await self.client.messages.create(**kwargs)
 
         return {
@@ -106,6 +84,73 @@ class AnthropicProvider(BaseLLMProvider):
             "finish_reason": response.stop_reason
         }
 
+    async def stream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        流式输出 Claude 响应 / Stream Claude response token by token
+
+        Args:
+            messages: 消息列表 / List of messages.
+            temperature: 覆盖温度 / Override temperature.
+            max_tokens: 覆盖token数 / Override max tokens.
+
+        Yields:
+            文本片段 / Text chunks as they arrive.
+        """
+        kwargs = self._build_request(messages, temperature, max_tokens)
+        async with self.client.messages.stream(**kwargs) as stream:
+            async for text in stream.text_stream:
+                if text:
+                    yield text
+
+    def _build_request(
+        self,
+        messages: List[Dict[str, Any]],
+        temperature: Optional[float],
+        max_tokens: Optional[int]
+    ) -> Dict[str, Any]:
+        """
+        构建 Anthropic 请求参数 / Build Anthropic request kwargs
+
+        Extracts the system message (Claude expects it as a separate parameter)
+        and converts cache-tagged messages into text blocks with cache_control.
+        """
+        system_message, filtered_messages = self._split_messages(messages)
+        kwargs = {
+            "model": self.model,
+            "messages": filtered_messages,
+            "temperature": temperature or self.temperature,
+            "max_tokens": max_tokens or self.max_tokens
+        }
+        if system_message:
+            kwargs["system"] = system_message
+        return kwargs
+
+    @staticmethod
+    def _split_messages(messages: List[Dict[str, Any]]) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """提取系统消息并转换缓存标记 / Extract system message and convert cache markers."""
+        system_message = None
+        filtered_messages = []
+        for msg in messages:
+            if msg["role"] == "system":
+                system_message = msg["content"]
+            elif CACHE_CONTROL_KEY in msg:
+                filtered_messages.append({
+                    "role": msg["role"],
+                    "content": [{
+                        "type": "text",
+                        "text": msg["content"],
+                        CACHE_CONTROL_KEY: msg[CACHE_CONTROL_KEY],
+                    }],
+                })
+            else:
+                filtered_messages.append(msg)
+        return system_message, filtered_messages
+
     def get_provider_name(self) -> str:
         """获取提供商名称 / Get provider name."""
         return "anthropic"
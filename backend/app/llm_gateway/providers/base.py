@@ -15,6 +15,9 @@ License: PolyForm Noncommercial License 1.0.0
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, AsyncGenerator
 
+# 消息级提示词缓存标记键 / Message-level prompt-cache marker key
+CACHE_CONTROL_KEY = "cache_control"
+
 
 class BaseLLMProvider(ABC):
     """
@@ -28,8 +31,11 @@ class BaseLLMProvider(ABC):
         model (str): 模型名称 / Model name/identifier.
         max_tokens (int): 最大生成token数 / Maximum tokens to generate.
         temperature (float): 生成温度 / Sampling temperature (0.0-1.0).
+        supports_prompt_cache (bool): 是否支持显式缓存标记 / Whether explicit cache markers are honored.
     """
 
+    supports_prompt_cache: bool = False
+
     def __init__(
         self,
         api_key: str,
@@ -104,6 +110,23 @@ class BaseLLMProvider(ABC):
         response = await self.chat(messages, temperature, max_tokens)
         yield response.get("content", "")
 
+    def prepare_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        清理提供商不支持的缓存标记 / Drop prompt-cache markers the provider does not support
+
+        Agents may tag a stable context message with ``cache_control``. Providers
+        without explicit prompt caching receive the messages without that key.
+
+        Args:
+            messages: 消息列表 / Message list.
+
+        Returns:
+            可直接发送的消息列表 / Message list safe to send to this provider.
+        """
+        if self.supports_prompt_cache or not any(CACHE_CONTROL_KEY in msg for msg in messages):
+            return messages
+        return [{k: v for k, v in msg.items() if k != CACHE_CONTROL_KEY} for msg in messages]
+
     @abstractmethod
     def get_provider_name(self) -> str:
         """获取提供商名称 / Get provider name (e.g., 'openai', 'anthropic')."""
@@ -13,6 +13,7 @@ License: PolyForm Noncommercial License 1.0.0
   所有方法通过 self 访问 Orchestrator 的 storage / agent / select_engine 等属性。
 """
 
+import asyncio
 import time
 from typing import Any, Dict, List, Optional
 
@@ -36,6 +37,9 @@ class AnalysisMixin:
     Supports batch operations for efficient multi-chapter processing.
     """
 
+    # 批量分析时同时进行的章节数上限 / Max chapters analyzed concurrently in analyze_batch
+    ANALYZE_BATCH_CONCURRENCY = 4
+
     def _resolve_volume_id_from_analysis(self, chapter: str, analysis: Dict[str, Any]) -> str:
         """
         从分析结果中最好地解析volume_id / Best-effort resolve volume_id for batching volume summary refresh.
@@ -68,16 +72,14 @@ class AnalysisMixin:
 
         Generates volume-level summaries by aggregating chapter summaries.
         Prevents redundant processing by deduplicating volume IDs.
+        各卷互不依赖，LLM 调用并发执行 / Volumes are independent, so their LLM calls overlap.
 
         Args:
             project_id: 项目ID / Project identifier.
             volume_ids: 分卷ID列表 / List of volume IDs to refresh.
         """
-        seen = set()
-        for volume_id in [str(v or "").strip() for v in (volume_ids or []) if str(v or "").strip()]:
-            if volume_id in seen:
-                continue
-            seen.add(volume_id)
+
+        async def refresh_one(volume_id: str) -> None:
             try:
                 volume_summaries = await self.draft_storage.list_chapter_summaries(project_id, volume_id=volume_id)
                 volume_summary = await self.archivist.generate_volume_summary(
@@ -89,6 +91,11 @@ class AnalysisMixin:
             except Exception as exc:
                 logger.warning("Failed to refresh volume summary for %s: %s", volume_id, exc)
 
+        unique_ids = dict.fromkeys(str(v or "").strip() for v in (volume_ids or []))
+        unique_ids.pop("", None)
+        if unique_ids:
+            await asyncio.gather(*(refresh_one(volume_id) for volume_id in unique_ids))
+
     async def analyze_chapter(
         self,
         project_id: str,
@@ -320,29 +327,32 @@ class AnalysisMixin:
         Returns:
             Batch result dict with per-chapter analysis payload.
         """
-        results = []
-        for chapter in chapters:
-            try:
-                versions = await self.draft_storage.list_draft_versions(project_id, chapter)
-                if not versions:
-                    results.append({"chapter": chapter, "success": False, "error": "No draft found"})
-                    continue
-                latest = versions[-1]
-                draft = await self.draft_storage.get_draft(project_id, chapter, latest)
-                if not draft:
-                    results.append({"chapter": chapter, "success": False, "error": "Draft content missing"})
-                    continue
-                analysis = await self._build_analysis(
-                    project_id=project_id,
-                    chapter=chapter,
-                    content=draft.content,
-                    chapter_title=None,
-                )
-                results.append({"chapter": chapter, "success": True, "analysis": analysis})
-            except Exception as exc:
-                results.append({"chapter": chapter, "success": False, "error": str(exc)})
+        # 各章节互不依赖：有界并发执行，单章失败只影响自身结果
+        # Chapters are independent: run with bounded concurrency; a failure only affects its own entry
+        semaphore = asyncio.Semaphore(self.ANALYZE_BATCH_CONCURRENCY)
 
-        return {"success": True, "results": results}
+        async def analyze_one(chapter: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    versions = await self.draft_storage.list_draft_versions(project_id, chapter)
+                    if not versions:
+                        return {"chapter": chapter, "success": False, "error": "No draft found"}
+                    latest = versions[-1]
+                    draft = await self.draft_storage.get_draft(project_id, chapter, latest)
+                    if not draft:
+                        return {"chapter": chapter, "success": False, "error": "Draft content missing"}
+                    analysis = await self._build_analysis(
+                        project_id=project_id,
+                        chapter=chapter,
+                        content=draft.content,
+                        chapter_title=None,
+                    )
+                    return {"chapter": chapter, "success": True, "analysis": analysis}
+                except Exception as exc:
+                    return {"chapter": chapter, "success": False, "error": str(exc)}
+
+        results = await asyncio.gather(*(analyze_one(chapter) for chapter in chapters))
+        return {"success": True, "results": list(results)}
 
     async def save_analysis_batch(
         self,
@@ -453,6 +463,7 @@ class AnalysisMixin:
             if len(facts_input) > 5:
                 facts_input = facts_input[:5]
 
+            new_facts: List[Fact] = []
             for item in facts_input:
                 fact_data = item if isinstance(item, dict) else {}
                 fact_data = {**fact_data}
@@ -465,22 +476,27 @@ class AnalysisMixin:
                     fact_data["id"] = f"F{next_fact_index:04d}"
                     next_fact_index += 1
                 existing_ids.add(fact_data["id"])
-                await self.canon_storage.add_fact(project_id, Fact(**fact_data))
-                facts_saved += 1
+                new_facts.append(Fact(**fact_data))
+            await self.canon_storage.add_facts(project_id, new_facts)
+            facts_saved = len(new_facts)
 
+            new_events: List[TimelineEvent] = []
             for item in analysis.get("timeline_events", []) or []:
                 event_data = item if isinstance(item, dict) else {}
                 event_data = {**event_data, "source": event_data.get("source") or chapter}
-                await self.canon_storage.add_timeline_event(project_id, TimelineEvent(**event_data))
-                timeline_saved += 1
+                new_events.append(TimelineEvent(**event_data))
+            await self.canon_storage.add_timeline_events(project_id, new_events)
+            timeline_saved = len(new_events)
 
+            new_states: List[CharacterState] = []
             for item in analysis.get("character_states", []) or []:
                 state_data = item if isinstance(item, dict) else {}
                 if not state_data.get("character"):
                     continue
                 state_data = {**state_data, "last_seen": state_data.get("last_seen") or chapter}
-                await self.canon_storage.update_character_state(project_id, CharacterState(**state_data))
-                states_saved += 1
+                new_states.append(CharacterState(**state_data))
+            await self.canon_storage.update_character_states(project_id, new_states)
+            states_saved = len(new_states)
 
             cards_created = await self._create_cards_from_proposals(
                 project_id=project_id,
@@ -544,14 +560,9 @@ class AnalysisMixin:
                 final_draft=content,
             )
 
-            for fact in canon_updates.get("facts", []) or []:
-                await self.canon_storage.add_fact(project_id, fact)
-
-            for event in canon_updates.get("timeline_events", []) or []:
-                await self.canon_storage.add_timeline_event(project_id, event)
-
-            for state in canon_updates.get("character_states", []) or []:
-                await self.canon_storage.update_character_state(project_id, state)
+            await self.canon_storage.add_facts(project_id, canon_updates.get("facts", []) or [])
+            await self.canon_storage.add_timeline_events(project_id, canon_updates.get("timeline_events", []) or [])
+            await self.canon_storage.update_character_states(project_id, canon_updates.get("character_states", []) or [])
 
             try:
                 report = await self.canon_storage.detect_conflicts(
@@ -13,11 +13,13 @@ License: PolyForm Noncommercial License 1.0.0
   所有方法通过 self 访问 Orchestrator 的 storage / agent / select_engine 等属性。
 """
 
+import asyncio
+from collections import defaultdict
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from app.context_engine.token_counter import count_tokens
-from app.context_engine.budget_manager import create_budget_manager
+from app.context_engine.models import ContextItem, ContextType
+from app.context_engine.budget_manager import get_agent_allocation
 from app.context_engine.trace_collector import trace_collector
 from app.schemas.draft import SceneBrief
 from app.utils.text import normalize_newlines
@@ -376,19 +378,20 @@ class ContextMixin:
         evidence_items = ((working_memory_payload.get("evidence_pack") or {}).get("items") or [])
         seed_entities = working_memory_payload.get("seed_entities") or []
 
-        card_names: List[str] = []
+        # dict 充当有序集合，成员判断 O(1) / dict as an ordered set for O(1) membership
+        ordered_names: Dict[str, None] = {}
         for item in evidence_items:
             if not isinstance(item, dict):
                 continue
             source = item.get("source") or {}
             card = str(source.get("card") or "").strip()
-            if card and card not in card_names:
-                card_names.append(card)
+            if card:
+                ordered_names.setdefault(card)
         for name in seed_entities:
             n = str(name or "").strip()
-            if n and n not in card_names:
-                card_names.append(n)
-        card_names = card_names[:12]
+            if n:
+                ordered_names.setdefault(n)
+        card_names = list(ordered_names)[:12]
 
         characters = []
         world = []
@@ -537,83 +540,90 @@ class ContextMixin:
         memory_pack_source: str = "writer",
     ) -> Dict[str, Any]:
         """Prepare context for writer and return trace info."""
-        critical_items = await self.select_engine.deterministic_select(
-            project_id, "writer", self.storage_adapter
-        )
 
-        query = f"{scene_brief.title} {scene_brief.goal}" if scene_brief else chapter_goal
-        try:
-            from app.services.chapter_binding_service import chapter_binding_service
-            seeds = await chapter_binding_service.get_seed_entities(
-                project_id,
-                chapter,
-                window=2,
-                ensure_built=True,
-            )
-            if seeds:
-                query = f"{query} {' '.join(seeds)}".strip()
-        except Exception as exc:
-            logger.warning("Seed entity lookup failed: %s", exc)
-            seeds = []
-        dynamic_items = await self.select_engine.retrieval_select(
-            project_id=project_id,
-            query=query,
-            item_types=["character", "world", "fact", "text_chunk"],
-            storage=self.storage_adapter,
-            top_k=10,
-        ) or []
+        async def retrieve_dynamic_items() -> List[ContextItem]:
+            query = f"{scene_brief.title} {scene_brief.goal}" if scene_brief else chapter_goal
+            try:
+                from app.services.chapter_binding_service import chapter_binding_service
+                seeds = await chapter_binding_service.get_seed_entities(
+                    project_id,
+                    chapter,
+                    window=2,
+                    ensure_built=True,
+                )
+                if seeds:
+                    query = f"{query} {' '.join(seeds)}".strip()
+            except Exception as exc:
+                logger.warning("Seed entity lookup failed: %s", exc)
+            return await self.select_engine.retrieval_select(
+                project_id=project_id,
+                query=query,
+                item_types=["character", "world", "fact", "text_chunk"],
+                storage=self.storage_adapter,
+                top_k=10,
+            ) or []
+
+        # 确定性选择、检索、事实表与上下文包互不依赖，并发读取
+        # Deterministic selection, retrieval, canon and the context package are independent; fetch concurrently
+        critical_items, dynamic_items, timeline, character_states, context_package = await asyncio.gather(
+            self.select_engine.deterministic_select(project_id, "writer", self.storage_adapter),
+            retrieve_dynamic_items(),
+            self.canon_storage.get_all_timeline_events(project_id),
+            self.canon_storage.get_all_character_states(project_id),
+            self.draft_storage.get_context_for_writing(project_id, chapter),
+        )
 
         style_card = next((item.content for item in critical_items if item.type.value == "style_card"), None)
 
-        character_cards = []
-        world_cards = []
-        facts = []
-        text_chunks = []
-
+        # 按类型一次分组，再分别展开 / Group by type in one pass, then expand each group
+        items_by_type: Dict[ContextType, List[ContextItem]] = defaultdict(list)
         for item in dynamic_items:
-            if item.type.value == "character_card":
-                name = item.id.replace("char_", "")
-                card = await self.card_storage.get_character_card(project_id, name)
-                if card:
-                    character_cards.append(card)
-            elif item.type.value == "world_card":
-                name = item.id.replace("world_", "")
-                card = await self.card_storage.get_world_card(project_id, name)
-                if card:
-                    world_cards.append(card)
-            elif item.type.value == "fact":
-                facts.append(item.content)
-            elif item.type.value == "text_chunk":
-                source = item.metadata.get("source") or {}
-                text_chunks.append(
-                    {
-                        "text": item.content,
-                        "chapter": source.get("chapter"),
-                        "source": source,
-                    }
-                )
+            items_by_type[item.type].append(item)
 
-        timeline = await self.canon_storage.get_all_timeline_events(project_id)
-        character_states = await self.canon_storage.get_all_character_states(project_id)
-
-        context_package = await self.draft_storage.get_context_for_writing(project_id, chapter)
+        character_results, world_results = await asyncio.gather(
+            asyncio.gather(
+                *(
+                    self.card_storage.get_character_card(project_id, item.id.replace("char_", ""))
+                    for item in items_by_type[ContextType.CHARACTER_CARD]
+                )
+            ),
+            asyncio.gather(
+                *(
+                    self.card_storage.get_world_card(project_id, item.id.replace("world_", ""))
+                    for item in items_by_type[ContextType.WORLD_CARD]
+                )
+            ),
+        )
+        character_cards = [card for card in character_results if card]
+        world_cards = [card for card in world_results if card]
+        facts = [item.content for item in items_by_type[ContextType.FACT]]
+        # 构建正文片段时同步记录去重键，供后续合并尾部片段使用
+        # Record dedup keys while building text chunks, for the tail-chunk merge below
+        text_chunks = []
+        seen_chunks = set()
+        for item in items_by_type[ContextType.TEXT_CHUNK]:
+            source = item.metadata.get("source") or {}
+            chapter_id = source.get("chapter")
+            text_chunks.append({"text": item.content, "chapter": chapter_id, "source": source})
+            seen_chunks.add((chapter_id, item.content))
 
         # 使用动态预算管理器替代硬编码值
         writer_model = self.gateway.get_model_for_agent("writer")
         writer_profile = self.gateway.get_profile_for_agent("writer")
-        budget_manager = create_budget_manager(
+
+        # 计算已使用的 tokens：ContextItem 构造时已计数，直接复用
+        # Items were counted at construction; reuse token_count instead of re-tokenizing
+        base_tokens = sum(item.token_count for item in critical_items) + sum(
+            item.token_count for item in dynamic_items
+        )
+
+        # 从预算管理器获取分配
+        allocation = get_agent_allocation(
+            "writer",
             profile=writer_profile,
             model_name=writer_model,
             max_output_tokens=writer_profile.get("max_tokens", 8000) if writer_profile else 8000,
         )
-
-        # 计算已使用的 tokens
-        critical_tokens = sum(count_tokens(str(c)) for c in critical_items)
-        dynamic_tokens = sum(count_tokens(str(i.content)) for i in dynamic_items)
-        base_tokens = critical_tokens + dynamic_tokens
-
-        # 从预算管理器获取分配
-        allocation = budget_manager.allocate_for_agent("writer")
         # 上下文包的预算 = summaries + current_draft 的预算
         context_budget = max(0, allocation["summaries"] + allocation["current_draft"] - base_tokens)
 
@@ -631,23 +641,27 @@ class ContextMixin:
         context_package = trimmed_context
 
         tail_chunks = context_package.get("previous_tail_chunks") or []
-        if tail_chunks:
-            seen = {(item.get("chapter"), item.get("text")) for item in text_chunks if isinstance(item, dict)}
-            for chunk in tail_chunks:
-                if not isinstance(chunk, dict):
-                    continue
-                key = (chunk.get("chapter"), chunk.get("text"))
-                if key in seen:
-                    continue
-                text_chunks.append(chunk)
-                seen.add(key)
+        for chunk in tail_chunks:
+            if not isinstance(chunk, dict):
+                continue
+            key = (chunk.get("chapter"), chunk.get("text"))
+            if key in seen_chunks:
+                continue
+            text_chunks.append(chunk)
+            seen_chunks.add(key)
 
         if character_names:
-            for name in character_names:
-                if not any(getattr(c, "name", None) == name for c in character_cards):
-                    card = await self.card_storage.get_character_card(project_id, name)
-                    if card:
-                        character_cards.append(card)
+            # 已检索到的角色卡按名称去重，缺失的一并并发加载
+            # Skip names already retrieved; load the missing cards concurrently
+            loaded_names = {getattr(c, "name", None) for c in character_cards}
+            missing = [name for name in dict.fromkeys(character_names) if name not in loaded_names]
+            extra_cards = await asyncio.gather(
+                *(self.card_storage.get_character_card(project_id, name) for name in missing)
+            )
+            for card in extra_cards:
+                if card and getattr(card, "name", None) not in loaded_names:
+                    loaded_names.add(getattr(card, "name", None))
+                    character_cards.append(card)
 
         working_memory_payload = await self._prepare_memory_pack_payload(
             project_id=project_id,
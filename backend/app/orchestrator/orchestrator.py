@@ -1268,35 +1268,39 @@ class Orchestrator(ContextMixin, AnalysisMixin):
         从最远的（列表末尾）开始删除。
         """
         trimmed = dict(context_package or {})
+        # 每项的 token 估算只算一次并维护累计值，删除时增量扣减，避免每次 pop 后全量重算
+        item_tokens: Dict[str, List[int]] = {}
         for key in ["full_facts", "summary_with_events", "summary_only", "title_only", "volume_summaries"]:
             trimmed[key] = list(trimmed.get(key, []) or [])
+            item_tokens[key] = [len(str(item)) // 2 for item in trimmed[key]]
 
-        before = self._estimate_context_tokens(trimmed)
+        before = sum(sum(tokens) for tokens in item_tokens.values())
         if before <= max_tokens:
             return trimmed, {"trimmed": False, "before": before, "after": before}
 
         if max_tokens <= 0:
             for key in ["summary_with_events", "summary_only", "title_only", "volume_summaries"]:
                 trimmed[key] = []
-            return trimmed, {"trimmed": True, "before": before, "after": self._estimate_context_tokens(trimmed)}
+            return trimmed, {"trimmed": True, "before": before, "after": sum(item_tokens["full_facts"])}
 
         # Removal order: lowest priority categories first
         removal_order = ["title_only", "volume_summaries", "summary_only", "summary_with_events"]
-        while self._estimate_context_tokens(trimmed) > max_tokens:
+        total = before
+        while total > max_tokens:
             removed_any = False
             for key in removal_order:
                 if trimmed[key]:
                     # pop() removes from the end (farthest/least relevant),
                     # preserving items closest to the current chapter
                     trimmed[key].pop()
+                    total -= item_tokens[key].pop()
                     removed_any = True
-                    if self._estimate_context_tokens(trimmed) <= max_tokens:
+                    if total <= max_tokens:
                         break
             if not removed_any:
                 break
 
-        after = self._estimate_context_tokens(trimmed)
-        return trimmed, {"trimmed": True, "before": before, "after": after}
+        return trimmed, {"trimmed": True, "before": before, "after": total}
 
     def _merge_card_description(self, description: str, rationale: str) -> str:
         description_text = (description or "").strip()
@@ -31,6 +31,25 @@ card_storage = get_card_storage()
 canon_storage = get_canon_storage()
 draft_storage = get_draft_storage()
 
+# Archivist instances are stateless between calls; reuse one per language and rebuild when the gateway is reset.
+# 档案员实例在调用间无状态：按语言复用，网关重置后重建。
+_archivist_pool: Dict[str, ArchivistAgent] = {}
+
+
+def _get_archivist(language: str) -> ArchivistAgent:
+    gateway = get_gateway()
+    agent = _archivist_pool.get(language)
+    if agent is None or agent.gateway is not gateway:
+        agent = ArchivistAgent(
+            gateway=gateway,
+            card_storage=card_storage,
+            canon_storage=canon_storage,
+            draft_storage=draft_storage,
+            language=language,
+        )
+        _archivist_pool[language] = agent
+    return agent
+
 
 def _is_http_url(url: str) -> bool:
     """Allow any http/https URL for manual crawling/analysis."""
@@ -189,13 +208,7 @@ async def extract_cards(request: ExtractRequest):
             return {"success": False, "error": "没有可提取的内容。", "proposals": []}
 
         language = await _resolve_project_language(request.project_id, request.language)
-        agent = ArchivistAgent(
-            gateway=get_gateway(),
-            card_storage=card_storage,
-            canon_storage=canon_storage,
-            draft_storage=draft_storage,
-            language=language,
-        )
+        agent = _get_archivist(language)
 
         proposal = await agent.extract_fanfiction_card(title=title, content=content)
         proposal["source_url"] = url
@@ -234,13 +247,7 @@ async def batch_extract_cards(request: BatchExtractRequest):
         results = await crawler_service.scrape_pages_concurrent(urls)
 
         language = await _resolve_project_language(request.project_id, request.language)
-        agent = ArchivistAgent(
-            gateway=get_gateway(),
-            card_storage=card_storage,
-            canon_storage=canon_storage,
-            draft_storage=draft_storage,
-            language=language,
-        )
+        agent = _get_archivist(language)
 
         proposals: List[Dict[str, Any]] = []
         for page in results:
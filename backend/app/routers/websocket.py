@@ -89,13 +89,21 @@ async def trace_websocket_endpoint(websocket: WebSocket):
 
     from app.context_engine.trace_collector import trace_collector, TraceEvent
 
+    last_stats_revision = -1
+
     async def on_trace_event(event: TraceEvent):
+        nonlocal last_stats_revision
         await trace_manager.broadcast({
             "type": "trace_event",
             "payload": event.to_dict(),
         })
 
-        if event.type in ["llm_request", "context_select", "context_compress", "context_health_check"]:
+        # 统计未变化时不重复推送（与上次发送的内容相同）
+        if (
+            event.type in ["llm_request", "context_select", "context_compress", "context_health_check"]
+            and trace_collector.stats_revision != last_stats_revision
+        ):
+            last_stats_revision = trace_collector.stats_revision
             stats = trace_collector.get_current_stats()
             await trace_manager.broadcast({
                 "type": "context_stats_update",
@@ -15,6 +15,8 @@ from __future__ import annotations
 
 import re
 import time
+from heapq import merge
+from operator import itemgetter
 from typing import Any, Dict, List, Optional, Tuple
 
 from app.schemas.evidence import EvidenceItem, EvidenceIndexMeta
@@ -952,11 +954,12 @@ def _apply_type_quotas(
     if limit == 0 or not scored:
         return []
 
+    score_key = itemgetter("score")
     by_type: Dict[str, List[Dict[str, Any]]] = {}
     for item in scored:
         by_type.setdefault(item["type"], []).append(item)
     for items in by_type.values():
-        items.sort(key=lambda x: x["score"], reverse=True)
+        items.sort(key=score_key, reverse=True)
 
     selected: List[Dict[str, Any]] = []
     counts = {t: 0 for t in quotas.keys()}
@@ -974,12 +977,9 @@ def _apply_type_quotas(
             used_ids.add(item["id"])
             counts[t] = counts.get(t, 0) + 1
 
-    remaining = []
-    for items in by_type.values():
-        remaining.extend(items)
-    remaining.sort(key=lambda x: x["score"], reverse=True)
-
-    for item in remaining:
+    # 各类型列表已有序，惰性归并即可，选满后不再继续 / Per-type lists are already sorted:
+    # lazily merge them (stable, O(n log k)) and stop as soon as the limit is reached.
+    for item in merge(*by_type.values(), key=score_key, reverse=True):
         if len(selected) >= limit:
             break
         if item["id"] in used_ids:
@@ -324,6 +324,26 @@ class BaseStorage:
             async with aiofiles.open(file_path, 'a', encoding=self.encoding) as f:
                 await f.write(json.dumps(item, ensure_ascii=False) + '\n')
 
+    async def append_jsonl_many(self, file_path: Path, items: list) -> None:
+        """
+        批量追加条目到JSONL文件（一次加锁、一次写入）
+
+        Append many items to a JSONL file under a single lock and write.
+
+        Args:
+            file_path: JSONL文件路径 / Path to JSONL file
+            items: 要追加的条目列表 / Items to append
+        """
+        if not items:
+            return
+        self.ensure_dir(file_path.parent)
+
+        payload = "".join(json.dumps(item, ensure_ascii=False) + '\n' for item in items)
+        file_lock = get_file_lock()
+        async with file_lock.lock(file_path):
+            async with aiofiles.open(file_path, 'a', encoding=self.encoding) as f:
+                await f.write(payload)
+
     async def write_jsonl(self, file_path: Path, items: list) -> None:
         """
         写入JSONL文件（带锁保护）
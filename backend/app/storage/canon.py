@@ -4,13 +4,57 @@ Manage facts, timeline events, and character states.
 """
 
 from typing import List, Optional, Dict, Any
+import asyncio
 import re
+from functools import lru_cache
 from app.storage.base import BaseStorage
 from app.storage.indexed_cache import get_index_cache
 from app.utils.chapter_id import parse_chapter_number, ChapterIDValidator
 from app.schemas.canon import Fact, TimelineEvent, CharacterState
 
 
+# 否定线索（不是/不/没有/无）合并为单个模式，一次扫描完成；"不是" 已被 "不" 覆盖
+_NEGATION_PATTERN = re.compile(r"[不无]|没有")
+
+
+@lru_cache(maxsize=4096)
+def _normalize_canon_text(text: str) -> str:
+    """Normalize text for comparison / 文本归一化（用于比较）"""
+    if not text:
+        return ""
+    t = text.strip().lower()
+    t = re.sub(r"\s+", "", t)
+    t = re.sub(r"[\,\.;:!?，。；：！？\"'“”‘’]", "", t)
+    return t
+
+
+def _contains_negation(normalized: str) -> bool:
+    return _NEGATION_PATTERN.search(normalized) is not None
+
+
+@lru_cache(maxsize=4096)
+def _contradiction_verdict(a: str, b: str) -> bool:
+    """Cached core of CanonStorage._maybe_contradict / 矛盾判断核心（带缓存）"""
+    na = _normalize_canon_text(a)
+    nb = _normalize_canon_text(b)
+    if not na or not nb:
+        return False
+
+    # If texts are identical, not a contradiction / 完全一致则不冲突
+    if na == nb:
+        return False
+
+    # If one contains negation cue and shares long common substring, flag
+    # 若一方有否定且共享较长公共片段，则认为可能冲突
+    if _contains_negation(na) != _contains_negation(nb):
+        # Common prefix-ish overlap heuristic / 简单重叠判断
+        nb_chars = set(nb)
+        common = sum(1 for ch in na if ch in nb_chars)
+        return common >= max(6, min(len(na), len(nb)) // 3)
+
+    return False
+
+
 class CanonStorage(BaseStorage):
 
     def _normalize_chapter_id(self, chapter_id: str) -> str:
@@ -136,6 +180,22 @@ class CanonStorage(BaseStorage):
         await get_index_cache().invalidate(project_id)
 
 
+    async def add_facts(self, project_id: str, facts: List[Fact]) -> None:
+        """
+        Add several facts with one append and one index invalidation.
+
+        Args:
+            project_id: Project ID.
+            facts: Facts to add.
+
+        """
+        if not facts:
+            return
+        file_path = self.get_project_path(project_id) / "canon" / "facts.jsonl"
+        await self.append_jsonl_many(file_path, [fact.model_dump() for fact in facts])
+        # 使索引失效
+        await get_index_cache().invalidate(project_id)
+
     async def update_fact(self, project_id: str, fact_data: Dict[str, Any]) -> bool:
         """Update an existing fact by ID."""
         file_path = self.get_project_path(project_id) / "canon" / "facts.jsonl"
@@ -266,6 +326,21 @@ class CanonStorage(BaseStorage):
         """
         file_path = self.get_project_path(project_id) / "canon" / "timeline.jsonl"
         await self.append_jsonl(file_path, event.model_dump())
+
+    async def add_timeline_events(
+        self,
+        project_id: str,
+        events: List[TimelineEvent]
+    ) -> None:
+        """
+        Add several timeline events in one append / 批量添加时间线事件
+        
+        Args:
+            project_id: Project ID / 项目ID
+            events: Timeline events to add / 要添加的事件
+        """
+        file_path = self.get_project_path(project_id) / "canon" / "timeline.jsonl"
+        await self.append_jsonl_many(file_path, [event.model_dump() for event in events])
     
     async def get_timeline_events_by_chapter(
         self,
@@ -382,46 +457,40 @@ class CanonStorage(BaseStorage):
         )
         await self.append_jsonl(file_path, state.model_dump())
 
+    async def update_character_states(
+        self,
+        project_id: str,
+        states: List[CharacterState]
+    ) -> None:
+        """
+        Update several character states in one append / 批量更新角色状态
+        
+        Args:
+            project_id: Project ID / 项目ID
+            states: Character states / 角色状态列表
+        """
+        file_path = (
+            self.get_project_path(project_id) /
+            "canon" / "character_state.jsonl"
+        )
+        await self.append_jsonl_many(file_path, [state.model_dump() for state in states])
+
     def _normalize_text(self, text: str) -> str:
         """Normalize text for comparison / 文本归一化（用于比较）"""
-        if not text:
-            return ""
-        t = text.strip().lower()
-        t = re.sub(r"\s+", "", t)
-        t = re.sub(r"[\,\.;:!?，。；：！？\"'“”‘’]", "", t)
-        return t
+        return _normalize_canon_text(text)
 
     def _has_negation(self, text: str) -> bool:
         """Check if text contains negation cue / 判断文本是否包含否定线索"""
-        t = self._normalize_text(text)
-        return any(x in t for x in ["不是", "不", "没有", "无"])
+        return _contains_negation(_normalize_canon_text(text))
 
     def _maybe_contradict(self, a: str, b: str) -> bool:
         """Heuristic contradiction check / 启发式矛盾判断
 
         This is intentionally conservative (low false positives).
         这个判断刻意保守（尽量减少误报）。
+        Verdicts are cached by statement pair. / 判定结果按语句对缓存。
         """
-        na = self._normalize_text(a)
-        nb = self._normalize_text(b)
-        if not na or not nb:
-            return False
-
-        # If texts are identical, not a contradiction / 完全一致则不冲突
-        if na == nb:
-            return False
-
-        # If one contains negation cue and shares long common substring, flag
-        # 若一方有否定且共享较长公共片段，则认为可能冲突
-        if self._has_negation(na) != self._has_negation(nb):
-            # Common prefix-ish overlap heuristic / 简单重叠判断
-            common = 0
-            for ch in na:
-                if ch in nb:
-                    common += 1
-            return common >= max(6, min(len(na), len(nb)) // 3)
-
-        return False
+        return _contradiction_verdict(a or "", b or "")
 
     async def detect_conflicts(
         self,
@@ -449,10 +518,24 @@ class CanonStorage(BaseStorage):
 
         conflicts: List[str] = []
 
+        # 三类既有设定互不依赖，并发读取；角色状态只读一次，避免逐角色重读整个文件
+        # Load the three canon sources concurrently; character states are read once
+        existing_facts, existing_events, all_states = await asyncio.gather(
+            self.get_all_facts(project_id),
+            self.get_all_timeline_events(project_id),
+            self.get_all_character_states(project_id),
+        )
+        latest_states: Dict[str, CharacterState] = {state.character: state for state in all_states}
+
+        # 相同陈述只保留首次出现者参与两两比较（报告取首个命中，结果不变）
+        # Compare each distinct statement once; the first match reported is unchanged
+        distinct_facts: Dict[str, Fact] = {}
+        for ef in existing_facts:
+            distinct_facts.setdefault(ef.statement, ef)
+
         # Compare facts / 对比事实
-        existing_facts = await self.get_all_facts(project_id)
         for nf in new_facts:
-            for ef in existing_facts:
+            for ef in distinct_facts.values():
                 if self._maybe_contradict(nf.statement, ef.statement):
                     conflicts.append(
                         f"[Fact Conflict] {nf.statement}  <->  {ef.statement} (from {ef.introduced_in})"
@@ -460,7 +543,6 @@ class CanonStorage(BaseStorage):
                     break
 
         # Compare timeline / 对比时间线
-        existing_events = await self.get_all_timeline_events(project_id)
         for ne in new_timeline_events:
             for ee in existing_events:
                 if self._normalize_text(ne.time) and self._normalize_text(ne.time) == self._normalize_text(ee.time):
@@ -475,7 +557,7 @@ class CanonStorage(BaseStorage):
         # Compare character state / 对比角色状态
         current_num = parse_chapter_number(chapter)
         for ns in new_character_states:
-            prev = await self.get_character_state(project_id, ns.character)
+            prev = latest_states.get(ns.character)
             if not prev:
                 continue
             if not prev.location or not ns.location:
@@ -3,6 +3,7 @@ Draft Storage
 Manages scene briefs, drafts, reviews, and summaries.
 """
 
+import asyncio
 import shutil
 from pathlib import Path
 from datetime import datetime, timezone
@@ -451,6 +452,39 @@ class DraftStorage(BaseStorage):
         summary.chapter = canonical or summary.chapter
         return self._ensure_volume_id(summary)
 
+    async def get_chapter_summaries_bulk(
+        self,
+        project_id: str,
+        chapters: List[str],
+    ) -> Dict[str, Optional[ChapterSummary]]:
+        """Get summaries for many chapters with one directory scan and concurrent reads."""
+        result: Dict[str, Optional[ChapterSummary]] = {chapter: None for chapter in chapters}
+        summaries_dir = self.get_project_path(project_id) / "summaries"
+        if not result or not summaries_dir.exists():
+            return result
+
+        paths: Dict[str, Path] = {}
+        for path in summaries_dir.glob("*_summary.yaml"):
+            name = path.stem.replace("_summary", "")
+            canonical = self._canonicalize_chapter_id(name)
+            if canonical not in paths or name == canonical:
+                paths[canonical] = path
+
+        async def load(chapter: str) -> Optional[ChapterSummary]:
+            canonical = self._canonicalize_chapter_id(chapter)
+            path = paths.get(canonical)
+            if path is None:
+                return None
+            data = await self.read_yaml(path)
+            summary = ChapterSummary(**data)
+            summary.chapter = canonical or summary.chapter
+            return self._ensure_volume_id(summary)
+
+        pending = list(result)
+        loaded = await asyncio.gather(*(load(chapter) for chapter in pending))
+        result.update(zip(pending, loaded))
+        return result
+
     async def list_chapter_summaries(
         self,
         project_id: str,
@@ -552,15 +586,32 @@ class DraftStorage(BaseStorage):
         """Get structured context for writing."""
         return await self.context_retriever.retrieve_context(project_id, current_chapter)
 
+    async def get_writing_bundle(
+        self, project_id: str, chapter: str
+    ) -> Tuple[Optional[SceneBrief], Dict[str, Any]]:
+        """Get the scene brief and writing context for a chapter in one concurrent round."""
+        scene_brief, context_package = await asyncio.gather(
+            self.get_scene_brief(project_id, chapter),
+            self.get_context_for_writing(project_id, chapter),
+        )
+        return scene_brief, context_package
+
     async def list_volume_summaries(self, project_id: str) -> List[VolumeSummary]:
         """List volume summaries."""
-        summaries: List[VolumeSummary] = []
         volumes = await self.volume_storage.list_volumes(project_id)
-        for volume in volumes:
-            summary = await self.volume_storage.get_volume_summary(project_id, volume.id)
-            if summary:
-                summaries.append(summary)
-        return summaries
+        return await self.get_volume_summaries_bulk(project_id, [volume.id for volume in volumes])
+
+    async def list_volume_summary_ids(self, project_id: str) -> List[str]:
+        """List ids of volumes that have a summary, in volume order, without reading the summaries."""
+        volumes = await self.volume_storage.list_volumes(project_id)
+        return [volume.id for volume in volumes if self.volume_storage.has_volume_summary(project_id, volume.id)]
+
+    async def get_volume_summaries_bulk(self, project_id: str, volume_ids: List[str]) -> List[VolumeSummary]:
+        """Get summaries for the given volumes concurrently, keeping order and skipping missing ones."""
+        summaries = await asyncio.gather(
+            *(self.volume_storage.get_volume_summary(project_id, volume_id) for volume_id in volume_ids)
+        )
+        return [summary for summary in summaries if summary]
 
     async def search_text_chunks(
         self,
@@ -109,6 +109,10 @@ class VolumeStorage(BaseStorage):
         data = await self.read_yaml(file_path)
         return VolumeSummary(**data)
 
+    def has_volume_summary(self, project_id: str, volume_id: str) -> bool:
+        """Check whether a volume summary exists without reading it."""
+        return self._get_volume_summary_file_path(project_id, volume_id).exists()
+
     async def get_volume_stats(self, project_id: str, volume_id: str) -> Optional[VolumeStats]:
         """Get volume stats derived from drafts."""
         volume = await self.get_volume(project_id, volume_id)
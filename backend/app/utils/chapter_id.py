@@ -17,9 +17,14 @@ License: PolyForm Noncommercial License 1.0.0
   - C3E1, C2I1 (番外/幕间 / Extra/Interlude)
 """
 
+from functools import lru_cache
 from typing import Dict, List, Optional
 import re
 
+# 权重缓存需容纳整个项目的章节 ID：顺序扫描超过容量的列表会让 LRU 每次都未命中。
+# Must hold a whole project's chapter IDs; a sequential scan larger than an LRU never hits.
+_WEIGHT_CACHE_SIZE = 65536
+
 
 def _normalize_chapter_id(chapter_id: str) -> str:
     """
@@ -162,6 +167,7 @@ class ChapterIDValidator:
         }
 
     @staticmethod
+    @lru_cache(maxsize=_WEIGHT_CACHE_SIZE)
     def calculate_weight(chapter_id: str) -> float:
         """
         计算章节的排序权重
@@ -189,6 +195,21 @@ class ChapterIDValidator:
             base += 0.1 * parsed["seq"]
         return float(base)
 
+    @staticmethod
+    def calculate_weights_bulk(chapter_ids: List[str]) -> List[float]:
+        """
+        批量计算章节权重（复用 calculate_weight 的缓存）
+
+        Calculate ordering weights for many chapter IDs, reusing the calculate_weight cache.
+
+        Args:
+            chapter_ids: 章节ID列表 / List of chapter IDs
+
+        Returns:
+            与输入一一对应的权重列表 / Weights aligned with chapter_ids
+        """
+        return list(map(ChapterIDValidator.calculate_weight, chapter_ids))
+
     @staticmethod
     def sort_chapters(chapter_ids: List[str]) -> List[str]:
         """
@@ -298,6 +319,7 @@ class ChapterIDValidator:
         return "未知"
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def calculate_distance(
         current_chapter: str,
         target_chapter: str,
@@ -341,6 +363,47 @@ class ChapterIDValidator:
         chapter_offset = min(current_ch, target_ch)
         return volume_distance * avg_chapters_per_volume + chapter_offset
 
+    @staticmethod
+    def calculate_distances_bulk(
+        current_chapter: str,
+        target_chapters: List[str],
+        avg_chapters_per_volume: int = 15,
+    ) -> List[int]:
+        """
+        批量计算当前章节到多个章节的距离（当前章节只解析一次）
+
+        Calculate distances from one chapter to many, parsing the current chapter once.
+
+        Args:
+            current_chapter: 当前章节ID / Current chapter ID
+            target_chapters: 目标章节ID列表 / Target chapter IDs
+            avg_chapters_per_volume: 平均每卷章数 / Average chapters per volume
+
+        Returns:
+            与 target_chapters 一一对应的距离列表，规则同 calculate_distance
+            / Distances aligned with target_chapters, same rules as calculate_distance
+        """
+        unknown = 10**9
+        current = ChapterIDValidator.parse(current_chapter)
+        if not current:
+            return [unknown] * len(target_chapters)
+
+        current_vol = current["volume"]
+        current_ch = current["chapter"]
+        parse = ChapterIDValidator.parse
+        distances: List[int] = []
+        for target_chapter in target_chapters:
+            target = parse(target_chapter)
+            if not target:
+                distances.append(unknown)
+            elif target["volume"] == current_vol:
+                distances.append(abs(current_ch - target["chapter"]))
+            else:
+                distances.append(
+                    abs(current_vol - target["volume"]) * avg_chapters_per_volume + min(current_ch, target["chapter"])
+                )
+        return distances
+
     @staticmethod
     def extract_volume_id(chapter_id: str) -> Optional[str]:
         """
@@ -13,9 +13,14 @@ License: PolyForm Noncommercial License 1.0.0
 
 from __future__ import annotations
 
+import asyncio
 import json
 from typing import Any, Iterable, Optional, Tuple
 
+# 超过该长度的响应在工作线程中解析，避免阻塞事件循环
+# Responses longer than this are parsed in a worker thread to keep the event loop free
+LARGE_PAYLOAD_CHARS = 64 * 1024
+
 
 def parse_json_payload(
     text: str,
@@ -73,6 +78,29 @@ def parse_json_payload(
     return None, "json_parse_failed"
 
 
+async def parse_json_payload_async(
+    text: str,
+    expected_type: Optional[type] = None,
+) -> Tuple[Optional[Any], str]:
+    """
+    异步版本的 parse_json_payload，大响应在线程中解析
+
+    Async variant of parse_json_payload. Small payloads are parsed inline;
+    payloads larger than LARGE_PAYLOAD_CHARS are parsed via asyncio.to_thread
+    so that long LLM outputs do not block other coroutines.
+
+    Args:
+        text: LLM响应文本 / LLM response text
+        expected_type: 期望的JSON类型（如dict、list） / Expected type (e.g., dict, list)
+
+    Returns:
+        元组 (数据, 错误消息) / Tuple of (data, error_message)
+    """
+    if text and len(text) > LARGE_PAYLOAD_CHARS:
+        return await asyncio.to_thread(parse_json_payload, text, expected_type)
+    return parse_json_payload(text, expected_type)
+
+
 def _try_parse_json(text: str, expected_type: Optional[type]) -> Optional[Any]:
     """
     尝试解析JSON字符串
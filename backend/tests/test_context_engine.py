@@ -0,0 +1,20 @@
+"""Test data structures in app.context_engine.*"""
+from app.context_engine.models import ToolTrace
+
+
+def _trace(result):
+    return ToolTrace(tool_name="lookup", arguments={}, result=result, success=True, timestamp=0.0)
+
+
+# --- ToolTrace ---
+
+class TestToolTracePreview:
+    def test_empty_result(self):
+        assert _trace(None).to_context_string() == "✓ lookup({}) → "
+
+    def test_dict_keeps_insertion_order(self):
+        assert _trace({"b": 1, "a": 2}).to_context_string().endswith("→ {'b': 1, 'a': 2}")
+
+    def test_large_results_match_str_prefix(self):
+        for result in ({f"k{i}": "v" * i for i in range(200)}, list(range(500)), "x" * 300, 12345):
+            assert _trace(result).to_context_string().endswith("→ " + str(result)[:100])
@@ -0,0 +1,47 @@
+"""Test budget planning in app.context.retriever"""
+from app.context.retriever import DynamicContextRetriever
+
+
+def _levels(retriever, count):
+    chapters = [f"V1C{i}" for i in range(1, count + 1)]
+    ranges = {"full_facts": 2, "summary_events": 5, "summary_only": 10, "title_only": 20}
+    return retriever._assign_retrieval_levels(chapters, f"V1C{count + 1}", ranges)
+
+
+# --- _assign_retrieval_levels ---
+
+class TestAssignRetrievalLevels:
+    def test_ordered_by_ascending_distance(self):
+        # _plan_levels relies on this ordering for truncation and nearest-first ties
+        retriever = DynamicContextRetriever(storage=None)
+        chapter_levels = _levels(retriever, 30)
+        assert [distance for _chapter_id, _level, distance in chapter_levels] == list(range(1, 31))
+        assert chapter_levels[0][0] == "V1C30"
+
+
+# --- _plan_levels ---
+
+class TestPlanLevels:
+    def test_ample_budget_keeps_distance_levels(self):
+        retriever = DynamicContextRetriever(storage=None)
+        chapter_levels = _levels(retriever, 15)
+        plan, used = retriever._plan_levels(chapter_levels, 100000)
+        assert plan == [(chapter_id, level) for chapter_id, level, _distance in chapter_levels]
+        assert used == sum(retriever._estimate_tokens(level) for _chapter_id, level, _distance in chapter_levels)
+
+    def test_tight_budget_prefers_nearer_chapters(self):
+        retriever = DynamicContextRetriever(storage=None)
+        chapter_levels = _levels(retriever, 5)
+        # Titles for all five chapters plus room for exactly one summary upgrade
+        budget = 5 * retriever.TOKENS_PER_TITLE + (retriever.TOKENS_PER_CHAPTER_SUMMARY - retriever.TOKENS_PER_TITLE)
+        plan, used = retriever._plan_levels(chapter_levels, budget)
+        assert used <= budget
+        assert plan[0] == ("V1C5", retriever.LEVEL_SUMMARY_WITH_EVENTS)
+        assert all(level == retriever.LEVEL_TITLE_ONLY for _chapter_id, level in plan[1:])
+
+    def test_title_capacity_drops_farthest_chapters(self):
+        retriever = DynamicContextRetriever(storage=None)
+        chapter_levels = _levels(retriever, 5)
+        plan, used = retriever._plan_levels(chapter_levels, 3 * retriever.TOKENS_PER_TITLE)
+        assert plan == [(chapter_id, retriever.LEVEL_TITLE_ONLY) for chapter_id in ("V1C5", "V1C4", "V1C3")]
+        assert used == 3 * retriever.TOKENS_PER_TITLE
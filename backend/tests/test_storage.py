@@ -39,3 +39,40 @@ async def test_write_and_read_text(storage, tmp_path):
     assert filepath.exists()
     result = await storage.read_text(filepath)
     assert "Hello world" in result
+
+
+@pytest.mark.asyncio
+async def test_append_jsonl_many(storage, tmp_path):
+    filepath = tmp_path / "items.jsonl"
+    await storage.append_jsonl(filepath, {"id": 1})
+    await storage.append_jsonl_many(filepath, [{"id": 2}, {"id": 3}])
+    await storage.append_jsonl_many(filepath, [])
+    assert [item["id"] for item in await storage.read_jsonl(filepath)] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_chapter_summaries_bulk(tmp_path):
+    from app.schemas.draft import ChapterSummary
+    from app.storage.drafts import DraftStorage
+
+    drafts = DraftStorage(data_dir=str(tmp_path))
+    await drafts.save_chapter_summary("proj", ChapterSummary(chapter="C1", title="One"))
+    await drafts.save_chapter_summary("proj", ChapterSummary(chapter="C2", title="Two"))
+
+    result = await drafts.get_chapter_summaries_bulk("proj", ["C1", "C2", "C3"])
+    assert result["C1"].title == "One"
+    assert result["C2"].title == "Two"
+    assert result["C3"] is None
+
+
+@pytest.mark.asyncio
+async def test_volume_summary_ids_and_bulk(tmp_path):
+    from app.schemas.volume import VolumeSummary
+    from app.storage.drafts import DraftStorage
+
+    drafts = DraftStorage(data_dir=str(tmp_path))
+    await drafts.volume_storage.save_volume_summary("proj", VolumeSummary(volume_id="V1", brief_summary="First"))
+
+    assert await drafts.list_volume_summary_ids("proj") == ["V1"]
+    summaries = await drafts.get_volume_summaries_bulk("proj", ["V1", "V9"])
+    assert [summary.brief_summary for summary in summaries] == ["First"]
@@ -2,6 +2,8 @@
 import pytest
 from app.utils.text import normalize_newlines, normalize_for_compare
 from app.utils.path_safety import sanitize_id, validate_path_within
+from app.utils.chapter_id import ChapterIDValidator
+from app.utils.llm_output import LARGE_PAYLOAD_CHARS, parse_json_payload, parse_json_payload_async
 from pathlib import Path
 
 
@@ -85,3 +87,53 @@ class TestValidatePathWithin:
         evil = tmp_path / ".." / "etc" / "passwd"
         with pytest.raises(ValueError, match="escapes"):
             validate_path_within(evil, tmp_path)
+
+
+# --- parse_json_payload ---
+
+class TestParseJsonPayload:
+    def test_plain_object(self):
+        assert parse_json_payload('{"a": 1}') == ({"a": 1}, "")
+
+    def test_code_block(self):
+        data, err = parse_json_payload('```json\n[1, 2]\n```', expected_type=list)
+        assert data == [1, 2]
+        assert err == ""
+
+    def test_type_mismatch(self):
+        data, err = parse_json_payload('{"a": 1}', expected_type=list)
+        assert data is None
+        assert err == "json_parse_failed"
+
+    @pytest.mark.asyncio
+    async def test_async_large_payload(self):
+        raw = '{"text": "' + "x" * (LARGE_PAYLOAD_CHARS + 1) + '"}'
+        data, err = await parse_json_payload_async(raw, expected_type=dict)
+        assert err == ""
+        assert len(data["text"]) == LARGE_PAYLOAD_CHARS + 1
+
+
+# --- ChapterIDValidator ---
+
+class TestChapterWeight:
+    def test_weights(self):
+        assert ChapterIDValidator.calculate_weight("V1C1") == 1001.0
+        assert ChapterIDValidator.calculate_weight("v1c1e1") == 1001.1
+
+    def test_invalid_is_zero(self):
+        assert ChapterIDValidator.calculate_weight("not-a-chapter") == 0.0
+
+    def test_repeated_calls_are_cached(self):
+        ChapterIDValidator.calculate_weight("V9C9")
+        hits = ChapterIDValidator.calculate_weight.cache_info().hits
+        assert ChapterIDValidator.calculate_weight("V9C9") == 9009.0
+        assert ChapterIDValidator.calculate_weight.cache_info().hits == hits + 1
+
+    def test_distances_bulk_matches_single(self):
+        targets = ["V1C5", "V2C3", "bogus", "V1C1E1"]
+        expected = [ChapterIDValidator.calculate_distance("V1C1", target) for target in targets]
+        assert ChapterIDValidator.calculate_distances_bulk("V1C1", targets) == expected
+        assert ChapterIDValidator.calculate_distances_bulk("bogus", targets) == [10**9] * 4
+
+    def test_weights_bulk(self):
+        assert ChapterIDValidator.calculate_weights_bulk(["V1C1", "V1C1E1", "x"]) == [1001.0, 1001.1, 0.0]